@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse
+
+from app.api.routers.todos import build_firestore_repository
+from app.core.config import settings
+from app.core.firestore import firestore_resilience
+from app.domain.exports.entities import ExportJob
+from app.repositories.exports.firestore_repository import FirestoreExportJobRepository
+from app.repositories.todos.resilient_repository import ResilientTodoRepository
+from app.schemas.exports import ExportCreate, ExportRead
+from app.schemas.todos import parse_fields
+from app.services.exports.service import ExportService
+from app.services.exports.writers import ExportFormatUnavailable
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+# Dedicated pool: exports never take threads from the request threadpool
+export_executor = ThreadPoolExecutor(max_workers=settings.export_max_workers, thread_name_prefix="todo-export")
+_export_service: ExportService | None = None
+
+
+# Dependency factory: swap this for another service in tests or other envs
+
+def get_export_service() -> ExportService:
+    global _export_service
+    if _export_service is None:
+        _export_service = ExportService(
+            jobs=FirestoreExportJobRepository(),
+            todos=lambda: ResilientTodoRepository(build_firestore_repository(), policy=firestore_resilience),
+            executor=export_executor,
+            export_dir=settings.export_dir,
+            page_size=settings.export_page_size,
+            bucket=settings.export_bucket,
+            prefix=settings.export_prefix,
+        )
+    return _export_service
+
+
+def shutdown_exports() -> None:
+    if _export_service is not None:
+        _export_service.shutdown(timeout=settings.server_graceful_timeout)
+
+
+def _to_read(job: ExportJob, request: Request, service: ExportService) -> ExportRead:
+    download_url = None
+    if job.status == "succeeded":
+        download_url = service.download_url(job) or str(request.url_for("download_export", job_id=job.id))
+    return ExportRead(
+        id=job.id,
+        format=job.format,
+        status=job.status,
+        include_archived=job.include_archived,
+        fields=job.fields,
+        rows_written=job.rows_written,
+        bytes_written=job.bytes_written,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error=job.error,
+        download_url=download_url,
+    )
+
+
+@router.post("", response_model=ExportRead, status_code=202)
+def create_export(
+    payload: ExportCreate, request: Request, service: ExportService = Depends(get_export_service)
+) -> ExportRead:
+    try:
+        fields = parse_fields(",".join(payload.fields)) if payload.fields is not None else None
+        job = service.start_export(payload.format, include_archived=payload.include_archived, fields=fields)
+    except (ValueError, ExportFormatUnavailable) as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return _to_read(job, request, service)
+
+
+@router.get("/{job_id}", response_model=ExportRead)
+def get_export(job_id: str, request: Request, service: ExportService = Depends(get_export_service)) -> ExportRead:
+    job = service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return _to_read(job, request, service)
+
+
+@router.get("/{job_id}/download", name="download_export")
+def download_export(job_id: str, service: ExportService = Depends(get_export_service)) -> FileResponse:
+    job = service.get_job(job_id)
+    if job is None or job.status != "succeeded" or not job.location:
+        raise HTTPException(status_code=404, detail="Export not found")
+    if job.location.startswith("gs://") or not os.path.exists(job.location):
+        # Local exports only exist on the instance that ran them; use export_bucket with several instances
+        raise HTTPException(status_code=404, detail="Export file not available on this instance")
+    return FileResponse(job.location, filename=os.path.basename(job.location))
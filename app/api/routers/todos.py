@@ -1,37 +1,113 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from datetime import timedelta
+from typing import List, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel
 
+from app.core.config import settings
+from app.core.firestore import firestore_resilience
+from app.core.single_flight import SingleFlight
 from app.repositories.todos.firestore_repository import FirestoreTodoRepository
-from app.schemas.todos import TodoCreate, TodoUpdate, TodoRead, TodoPage
+from app.repositories.todos.resilient_repository import ResilientTodoRepository
+from app.repositories.todos.sharded_repository import ShardedFirestoreTodoRepository
+from app.domain.todos.entities import TodoEntity
+from app.schemas.todos import (
+    TODO_FIELDS,
+    TodoCreate,
+    TodoPage,
+    TodoRead,
+    TodoSparse,
+    TodoUpdate,
+    parse_fields,
+    sparse_list_adapter,
+    sparse_page_model,
+    sparse_todo_model,
+)
 from app.services.todos.service import TodoService
+from app.services.todos.write_buffer import WriteCoalescer
 
 router = APIRouter(prefix="/todos", tags=["todos"])
 
+# Shared across requests so identical concurrent reads hit Firestore only once
+_read_flight = SingleFlight(name="todos.reads")
+# Shared so rapid updates to the same todo from different requests are merged
+write_buffer: WriteCoalescer | None = (
+    WriteCoalescer(window=settings.write_coalescing_window_ms / 1000)
+    if settings.write_coalescing_window_ms
+    else None
+)
+
+
+def build_firestore_repository() -> FirestoreTodoRepository:
+    archive_ttl = timedelta(days=settings.archive_ttl_days) if settings.archive_ttl_days else None
+    if settings.todo_storage_layout == "sharded":
+        return ShardedFirestoreTodoRepository(
+            deadlines=firestore_resilience.deadlines,
+            archive_ttl=archive_ttl,
+            shard_count=settings.todo_shard_count,
+        )
+    return FirestoreTodoRepository(deadlines=firestore_resilience.deadlines, archive_ttl=archive_ttl)
+
 
 # Dependency factory: swap this for another repository in tests or other envs
 
 def get_todo_service() -> TodoService:
-    repository = FirestoreTodoRepository()
-    return TodoService(repository=repository)
-
-
-@router.get("/", response_model=List[TodoRead])
-def list_todos(service: TodoService = Depends(get_todo_service)) -> List[TodoRead]:
-    entities = service.list_todos()
-    return [
-        TodoRead(
-            id=e.id,
-            title=e.title,
-            description=e.description,
-            completed=e.completed,
-            created_at=e.created_at,
-            updated_at=e.updated_at,
-        )
-        for e in entities
-    ]
+    repository = ResilientTodoRepository(build_firestore_repository(), policy=firestore_resilience)
+    return TodoService(repository=repository, single_flight=_read_flight, write_buffer=write_buffer)
+
+
+FIELDS_QUERY = Query(
+    default=None,
+    description="Comma-separated fields to return (sparse fieldset), e.g. `title,completed`. `id` is always included.",
+)
+
+INCLUDE_ARCHIVED_QUERY = Query(
+    default=False,
+    description="Also read completed todos moved to the archive collection.",
+)
+
+
+def _parse_fields(raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_fields(raw)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+def _to_read(e: TodoEntity) -> TodoRead:
+    return TodoRead(
+        id=e.id,
+        title=e.title,
+        description=e.description,
+        completed=e.completed,
+        created_at=e.created_at,
+        updated_at=e.updated_at,
+    )
+
+
+def _to_sparse(e: TodoEntity, fields: Tuple[str, ...]) -> BaseModel:
+    return sparse_todo_model(fields)(**{name: getattr(e, name) for name in fields})
+
+
+def _json(content: str | bytes) -> Response:
+    # Sparse responses are serialized from their trimmed model, bypassing response_model
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/", response_model=List[Union[TodoRead, TodoSparse]])
+def list_todos(
+    fields: Optional[str] = FIELDS_QUERY,
+    include_archived: bool = INCLUDE_ARCHIVED_QUERY,
+    service: TodoService = Depends(get_todo_service),
+):
+    field_set = _parse_fields(fields)
+    entities = service.list_todos(fields=field_set, include_archived=include_archived)
+    if field_set is not None:
+        items = [_to_sparse(e, field_set) for e in entities]
+        return _json(sparse_list_adapter(field_set).dump_json(items))
+    return [_to_read(e) for e in entities]
 
 
 @router.get("/paged", response_model=TodoPage)
@@ -39,20 +115,20 @@ def list_todos_paged(
     limit: int = 20,
     completed: Optional[bool] = None,
     after: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    include_archived: bool = INCLUDE_ARCHIVED_QUERY,
     service: TodoService = Depends(get_todo_service),
-) -> TodoPage:
+):
+    field_set = _parse_fields(fields)
+    projection = None
+    if field_set is not None:
+        # created_at drives the cursor and completed the filter, so read them even when not returned
+        projection = set(field_set) | {"created_at"}
+        if completed is not None:
+            projection.add("completed")
+        projection = tuple(name for name in TODO_FIELDS if name in projection)
     # Simple in-memory pagination leveraging existing list (for demo). For large datasets, use Firestore cursors.
-    items = [
-        TodoRead(
-            id=e.id,
-            title=e.title,
-            description=e.description,
-            completed=e.completed,
-            created_at=e.created_at,
-            updated_at=e.updated_at,
-        )
-        for e in service.list_todos()
-    ]
+    items = service.list_todos(fields=projection, include_archived=include_archived)
     if completed is not None:
         items = [i for i in items if i.completed == completed]
     # Cursor by ISO datetime of created_at
@@ -70,13 +146,18 @@ def list_todos_paged(
             start_index = 0
     page = items[start_index : start_index + max(1, min(100, limit))]
     next_cursor = page[-1].created_at if len(page) == max(1, min(100, limit)) else None
-    return TodoPage(items=page, next_cursor=next_cursor)
+    if field_set is not None:
+        sparse_page = sparse_page_model(field_set)(
+            items=[_to_sparse(e, field_set) for e in page], next_cursor=next_cursor
+        )
+        return _json(sparse_page.model_dump_json())
+    return TodoPage(items=[_to_read(e) for e in page], next_cursor=next_cursor)
 
 
 @router.post("/", response_model=TodoRead, status_code=201)
 def create_todo(payload: TodoCreate, service: TodoService = Depends(get_todo_service)) -> TodoRead:
     entity = service.create_todo(title=payload.title, description=payload.description, completed=payload.completed)
-    return TodoRead(**entity.__dict__)
+    return _to_read(entity)
 
 
 @router.put("/{todo_id}", response_model=TodoRead)
@@ -85,7 +166,7 @@ def update_todo(todo_id: str, payload: TodoUpdate, service: TodoService = Depend
     entity = service.update_todo(todo_id=todo_id, updates=updates)
     if entity is None:
         raise HTTPException(status_code=404, detail="Todo not found")
-    return TodoRead(**entity.__dict__)
+    return _to_read(entity)
 
 
 @router.delete("/{todo_id}", status_code=204)
@@ -96,9 +177,17 @@ def delete_todo(todo_id: str, service: TodoService = Depends(get_todo_service))
     return Response(status_code=204)
 
 
-@router.get("/{todo_id}", response_model=TodoRead)
-def get_todo(todo_id: str, service: TodoService = Depends(get_todo_service)) -> TodoRead:
-    entity = service.get_todo(todo_id)
+@router.get("/{todo_id}", response_model=Union[TodoRead, TodoSparse])
+def get_todo(
+    todo_id: str,
+    fields: Optional[str] = FIELDS_QUERY,
+    include_archived: bool = INCLUDE_ARCHIVED_QUERY,
+    service: TodoService = Depends(get_todo_service),
+):
+    field_set = _parse_fields(fields)
+    entity = service.get_todo(todo_id, fields=field_set, include_archived=include_archived)
     if entity is None:
         raise HTTPException(status_code=404, detail="Todo not found")
-    return TodoRead(**entity.__dict__)
+    if field_set is not None:
+        return _json(_to_sparse(entity, field_set).model_dump_json())
+    return _to_read(entity)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+from typing import Sequence
+
+from app.core.config import settings
+
+
+def _serve(args: argparse.Namespace) -> int:
+    from app.server import serve
+
+    overrides = {
+        key: value
+        for key, value in {
+            "server_host": args.host,
+            "app_port": args.port,
+            "server_workers": args.workers,
+        }.items()
+        if value is not None
+    }
+    serve(settings.model_copy(update=overrides))
+    return 0
+
+
+def _archive(args: argparse.Namespace) -> int:
+    from datetime import timedelta
+
+    from app.api.routers.todos import get_todo_service
+
+    days = settings.archive_after_days if args.older_than_days is None else args.older_than_days
+    moved = get_todo_service().archive_completed_todos(
+        older_than=timedelta(days=days),
+        batch_size=args.batch_size or settings.archive_batch_size,
+    )
+    print(f"Archived {moved} todos completed more than {days} days ago")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="todo-back", description="TODO SaaS backend")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the production HTTP server")
+    serve_parser.add_argument("--host", default=None, help="Bind address (default: settings.server_host)")
+    serve_parser.add_argument("--port", type=int, default=None, help="Bind port (default: settings.app_port)")
+    serve_parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    serve_parser.set_defaults(func=_serve)
+
+    archive_parser = subparsers.add_parser(
+        "archive", help="Move old completed todos to the archive collection (run from cron/Cloud Scheduler)"
+    )
+    archive_parser.add_argument(
+        "--older-than-days", type=int, default=None, help="Default: settings.archive_after_days"
+    )
+    archive_parser.add_argument("--batch-size", type=int, default=None, help="Default: settings.archive_batch_size")
+    archive_parser.set_defaults(func=_archive)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,11 @@
+from typing import Dict, List, Literal
+
 from pydantic_settings import BaseSettings
 from pydantic import Field, AliasChoices
 import os
 
+from app.core.rate_limit import RateLimitRule
+
 
 class Settings(BaseSettings):
     app_env: str = Field(default="development")
@@ -17,6 +21,89 @@ class Settings(BaseSettings):
         ),
     )
 
+    # Rate limiting: token bucket per client (API key header or IP).
+    # Route keys are "[METHOD ]/path" for exact matches or "[METHOD ]/prefix*" for prefixes.
+    rate_limit_enabled: bool = Field(default=True)
+    rate_limit_backend: Literal["memory", "redis"] = Field(default="memory")
+    rate_limit_redis_url: str | None = Field(default=None)
+    rate_limit_default: RateLimitRule = Field(default=RateLimitRule(rate=20, burst=40))
+    rate_limit_routes: Dict[str, RateLimitRule] = Field(
+        default={"GET /todos/": RateLimitRule(rate=1, burst=10)}
+    )
+    rate_limit_api_key_header: str = Field(default="X-API-Key")
+    # Keys that get a bucket of their own; requests with any other key are limited by IP
+    rate_limit_api_keys: List[str] = Field(default=[])
+    # Without it clients are keyed by the connecting address: behind a load balancer or
+    # Cloud Run that is the proxy, so every client shares one bucket (and the route rules
+    # become service-wide limits). Enable it there, with the number of proxies you run
+    # in front of the app (each appends one X-Forwarded-For entry).
+    rate_limit_trust_forwarded_for: bool = Field(default=False)
+    rate_limit_trusted_proxy_hops: int = Field(default=1, ge=1)
+    rate_limit_exempt_paths: List[str] = Field(default=["/health", "/metrics"])
+
+    # Load shedding: reject with 503 while too many Firestore calls are in flight (0 disables)
+    load_shed_max_inflight: int = Field(default=64)
+    load_shed_retry_after_seconds: int = Field(default=1)
+
+    # Storage layout: "flat" keeps every todo in `todos`; "sharded" spreads them over
+    # `todo_shards/{NNN}/todos` to avoid hot index ranges on `created_at` at high write rates
+    todo_storage_layout: Literal["flat", "sharded"] = Field(default="flat")
+    todo_shard_count: int = Field(default=16, ge=1)
+
+    # Merge PUTs to the same todo arriving within this window into one write (0 disables)
+    write_coalescing_window_ms: int = Field(default=0, ge=0)
+
+    # Archival: completed todos untouched for `archive_after_days` move to `todos_archive`
+    # (`todo-back archive`). With `archive_ttl_days`, archived docs get an `expire_at` field
+    # for a Firestore TTL policy that purges them permanently.
+    archive_after_days: int = Field(default=30, ge=0)
+    archive_batch_size: int = Field(default=200, ge=1)
+    archive_ttl_days: int | None = Field(default=None, ge=1)
+
+    # Bulk exports (`POST /exports`): background pool size, Firestore page size and destination.
+    # Files stay in `export_dir` unless `export_bucket` is set (uploaded to gs://bucket/prefix).
+    export_max_workers: int = Field(default=2, ge=1)
+    export_page_size: int = Field(default=500, ge=1)
+    export_dir: str = Field(default="exports")
+    export_bucket: str | None = Field(default=None)
+    export_prefix: str = Field(default="exports/")
+
+    # Firestore resilience: per-operation deadlines (seconds), retries for idempotent reads
+    # and a circuit breaker that fails fast with 503 while the backend is degraded
+    firestore_deadlines: Dict[str, float] = Field(
+        default={"list": 10.0, "get": 3.0, "create": 5.0, "update": 5.0, "delete": 5.0}
+    )
+    firestore_max_retries: int = Field(default=3)
+    firestore_retry_base_delay: float = Field(default=0.1)
+    firestore_retry_max_delay: float = Field(default=2.0)
+    circuit_breaker_failure_threshold: int = Field(default=5)
+    circuit_breaker_reset_timeout: float = Field(default=30.0)
+
+    # Logging: JSON lines on stdout, written by a background thread from a bounded queue.
+    # Records that do not fit in the queue are dropped (counted in /metrics) instead of blocking.
+    log_level: str = Field(default="INFO")
+    log_queue_size: int = Field(default=10000, ge=1)
+    # Access log: one line per request. Sample rates (0..1) are keyed like rate_limit_routes,
+    # by route template ("GET /todos/{todo_id}"); errors and slow requests are always logged.
+    access_log_enabled: bool = Field(default=True)
+    access_log_sample_rate: float = Field(default=1.0, ge=0, le=1)
+    access_log_sample_rates: Dict[str, float] = Field(default={"GET /health": 0.01, "GET /metrics": 0.01})
+    access_log_slow_ms: float = Field(default=1000.0)
+
+    # Production server (`todo-back serve`)
+    server_host: str = Field(default="0.0.0.0")
+    server_workers: int = Field(default=0)  # 0 = one worker per available CPU
+    server_keepalive_timeout: int = Field(default=5)
+    server_graceful_timeout: int = Field(default=30)
+    server_backlog: int = Field(default=2048)
+    server_preload: bool = Field(default=True)
+    # The Firestore client multiplexes calls over one gRPC channel (~100 concurrent streams);
+    # the sync threadpool is sized to match unless threadpool_size is set explicitly
+    firestore_max_concurrent_calls: int = Field(default=100)
+    threadpool_size: int = Field(default=0)
+    # Build the Firestore client in the lifespan hook instead of on the first request
+    firestore_warmup: bool = Field(default=False)
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -25,9 +112,12 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
-# Ensure GOOGLE_APPLICATION_CREDENTIALS is set for Google SDK if only TODO_* is provided
-if (
-    settings.google_application_credentials
-    and not os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
-):
-    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = settings.google_application_credentials
+
+def export_google_credentials(settings: Settings) -> None:
+    # Ensure GOOGLE_APPLICATION_CREDENTIALS is set for Google SDK if only TODO_* is provided.
+    # Called right before the first SDK client is built, not at import time.
+    if (
+        settings.google_application_credentials
+        and not os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+    ):
+        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = settings.google_application_credentials
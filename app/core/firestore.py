@@ -1,19 +1,72 @@
 from __future__ import annotations
 
-from typing import Optional
-from google.cloud import firestore
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, Optional
 
-from app.core.config import settings
+from app.core.config import export_google_credentials, settings
+from app.core.metrics import metrics
+from app.core.request_context import count_firestore_op
+from app.core.resilience import CircuitBreaker, ResiliencePolicy, RetryPolicy
 
+if TYPE_CHECKING:
+    from google.cloud import firestore
 
-_firestore_client: Optional[firestore.Client] = None
 
+_firestore_client: Optional["firestore.Client"] = None
 
-def get_firestore_client() -> firestore.Client:
+
+def get_firestore_client() -> "firestore.Client":
     global _firestore_client
     if _firestore_client is None:
+        # Imported lazily: the SDK is the heaviest import of the app and slows cold starts
+        from google.cloud import firestore
+
+        export_google_credentials(settings)
         if settings.gcp_project_id:
             _firestore_client = firestore.Client(project=settings.gcp_project_id)
         else:
             _firestore_client = firestore.Client()
     return _firestore_client
+
+
+class FirestoreCallTracker:
+    """Count Firestore calls currently in flight across all worker threads (and per request)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        count_firestore_op()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+firestore_calls = FirestoreCallTracker()
+metrics.register_gauge("firestore.in_flight", lambda: firestore_calls.in_flight)
+
+
+# Shared by every request so failures observed by one worker thread trip the breaker for all
+firestore_resilience = ResiliencePolicy(
+    breaker=CircuitBreaker(
+        failure_threshold=settings.circuit_breaker_failure_threshold,
+        reset_timeout=settings.circuit_breaker_reset_timeout,
+    ),
+    retry=RetryPolicy(
+        max_retries=settings.firestore_max_retries,
+        base_delay=settings.firestore_retry_base_delay,
+        max_delay=settings.firestore_retry_max_delay,
+    ),
+    deadlines=settings.firestore_deadlines,
+)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Any, Dict
+
+from app.core.metrics import metrics
+from app.core.request_context import request_id_var
+
+# Standard LogRecord attributes; anything else on a record came from `extra=` and is emitted as a field
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+    "taskName",
+    "request_id",
+    # uvicorn duplicates its message with ANSI colour codes for its own console formatter
+    "color_message",
+}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, request id and `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Hand records to the listener thread without ever blocking the caller.
+
+    When the queue is full the record is dropped and counted (`logging.dropped`).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stdlib version formats the record here so it can be pickled to another process.
+        # This queue is in-process: formatting is left to the listener thread and only the
+        # request context, which that thread cannot see, is captured now.
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.incr("logging.dropped")
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Producers are detached before stopping, so waiting for room here cannot deadlock
+        self.queue.put(self._sentinel)
+
+
+def setup_logging(level: str = "INFO", queue_size: int = 10000, stream: IO[str] | None = None) -> QueueListener:
+    """Route every logger through a bounded queue to a JSON stdout writer running in its own thread."""
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+    listener = _Listener(log_queue, output, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.addHandler(BoundedQueueHandler(log_queue))
+    root.setLevel(level.upper())
+    metrics.register_gauge("logging.queue_depth", log_queue.qsize)
+    listener.start()
+    return listener
+
+
+def shutdown_logging(listener: QueueListener) -> None:
+    """Detach the queue handler and write out the records still queued."""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, BoundedQueueHandler) and handler.queue is listener.queue:
+            root.removeHandler(handler)
+    metrics.unregister_gauge("logging.queue_depth", listener.queue.qsize)
+    listener.stop()
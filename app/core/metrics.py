@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from typing import Callable, Dict
+
+
+class MetricsRegistry:
+    """Process-local counters and gauges exposed through `/metrics`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._gauges: Dict[str, Callable[[], float]] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def get(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def register_gauge(self, name: str, fn: Callable[[], float]) -> None:
+        # Gauges are read lazily when a snapshot is taken
+        self._gauges[name] = fn
+
+    def unregister_gauge(self, name: str, fn: Callable[[], float] | None = None) -> None:
+        # With `fn`, only drop the gauge if it was not re-registered since
+        if fn is None or self._gauges.get(name) == fn:
+            self._gauges.pop(name, None)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            data: Dict[str, float] = dict(self._counters)
+        for name, fn in list(self._gauges.items()):
+            data[name] = fn()
+        return dict(sorted(data.items()))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Protocol, Tuple
+
+from pydantic import BaseModel, Field
+
+
+class RateLimitRule(BaseModel):
+    # Token bucket: `rate` tokens are refilled per second, up to `burst` tokens
+    rate: float = Field(gt=0)
+    burst: int = Field(ge=1)
+
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+
+class RateLimitBackend(Protocol):
+    async def acquire(self, key: str, rule: RateLimitRule) -> RateLimitDecision:
+        ...
+
+
+class InMemoryRateLimitBackend:
+    """Token buckets held in process memory. Each worker process limits independently."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, max_keys: int = 100_000) -> None:
+        self._clock = clock
+        self._max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> (tokens, last refill timestamp), least recently used first
+        self._buckets: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+
+    async def acquire(self, key: str, rule: RateLimitRule) -> RateLimitDecision:
+        now = self._clock()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (float(rule.burst), now))
+            tokens = min(float(rule.burst), tokens + (now - last) * rule.rate)
+            if tokens >= 1.0:
+                tokens -= 1.0
+                allowed = True
+                retry_after = 0.0
+            else:
+                allowed = False
+                retry_after = (1.0 - tokens) / rule.rate
+            if key in self._buckets:
+                self._buckets.move_to_end(key)
+            elif len(self._buckets) >= self._max_keys:
+                # Drop the least recently seen client only; active clients keep their state
+                self._buckets.popitem(last=False)
+            self._buckets[key] = (tokens, now)
+        return RateLimitDecision(allowed=allowed, remaining=int(tokens), retry_after=retry_after)
+
+
+# Atomic token bucket evaluated inside Redis so every worker shares the same buckets.
+_REDIS_TOKEN_BUCKET = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+  tokens = burst
+  ts = now
+end
+tokens = math.min(burst, tokens + (now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', key, math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend:
+    """Token buckets stored in Redis, shared by every worker and instance."""
+
+    def __init__(self, url: str, prefix: str = "todo:ratelimit:") -> None:
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("The 'redis' package is required for the redis rate limit backend") from exc
+        self._redis = redis_asyncio.from_url(url)
+        self._script = self._redis.register_script(_REDIS_TOKEN_BUCKET)
+        self._prefix = prefix
+
+    async def acquire(self, key: str, rule: RateLimitRule) -> RateLimitDecision:
+        allowed, tokens = await self._script(
+            keys=[self._prefix + key], args=[rule.rate, rule.burst, time.time()]
+        )
+        tokens = float(tokens)
+        if int(allowed):
+            return RateLimitDecision(allowed=True, remaining=int(tokens), retry_after=0.0)
+        return RateLimitDecision(allowed=False, remaining=0, retry_after=(1.0 - tokens) / rule.rate)
+
+
+def build_rate_limit_backend(backend: str, redis_url: str | None = None) -> RateLimitBackend:
+    if backend == "memory":
+        return InMemoryRateLimitBackend()
+    if backend == "redis":
+        if not redis_url:
+            raise ValueError("rate_limit_redis_url must be set when rate_limit_backend is 'redis'")
+        return RedisRateLimitBackend(redis_url)
+    raise ValueError(f"Unknown rate limit backend: {backend!r}")
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
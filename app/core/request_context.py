@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import threading
+from contextvars import ContextVar
+
+
+class RequestStats:
+    """Per-request counters, shared by reference with the worker threads serving the request."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.firestore_ops = 0
+
+    def count_firestore_op(self) -> None:
+        with self._lock:
+            self.firestore_ops += 1
+
+
+# Set by RequestIdMiddleware / AccessLogMiddleware. Starlette copies the context into the
+# threadpool running sync handlers; other executors must do so explicitly (copy_context()).
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+request_stats_var: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def count_firestore_op() -> None:
+    stats = request_stats_var.get()
+    if stats is not None:
+        stats.count_firestore_op()
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, TypeVar
+
+from app.core.metrics import metrics
+
+T = TypeVar("T")
+
+# Operations that can be repeated without changing the outcome. An archive batch re-checks
+# every document inside its transaction, so re-running it never moves a todo twice.
+IDEMPOTENT_OPERATIONS: FrozenSet[str] = frozenset({"list", "get", "archive"})
+
+# Time left until the deadline of the operation running under ResiliencePolicy.call
+_attempt_timeout: ContextVar[float | None] = ContextVar("attempt_timeout", default=None)
+
+
+def attempt_timeout() -> float | None:
+    """Seconds left for the current attempt, to be used as the SDK call timeout."""
+    return _attempt_timeout.get()
+
+
+class BackendUnavailableError(Exception):
+    """The backing store is failing or the circuit is open; callers should retry later."""
+
+    def __init__(self, message: str, retry_after: float = 1.0) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    try:
+        from google.api_core import exceptions as gexc
+    except ImportError:  # pragma: no cover - SDK always installed in prod
+        return False
+    return isinstance(
+        exc,
+        (
+            gexc.ServiceUnavailable,
+            gexc.DeadlineExceeded,
+            gexc.InternalServerError,
+            gexc.TooManyRequests,
+            gexc.ResourceExhausted,
+            gexc.Aborted,
+        ),
+    )
+
+
+class CircuitBreaker:
+    """Classic closed → open → half-open breaker counting consecutive failures."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self) -> None:
+        """Raise `BackendUnavailableError` instead of calling a backend known to be down."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            elapsed = self._clock() - self._opened_at
+            if self._state == self.OPEN and elapsed >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                # Let a single probe through; its outcome closes or re-opens the circuit
+                self._probe_in_flight = True
+                return
+            metrics.incr("circuit_breaker.rejected")
+            raise BackendUnavailableError(
+                "Circuit open: backend unavailable", retry_after=max(1.0, self.reset_timeout - elapsed)
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """End a call whose outcome says nothing about backend health (state is unchanged)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    metrics.incr("circuit_breaker.opened")
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+
+    def backoff(self, attempt: int) -> float:
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class ResiliencePolicy:
+    """Apply per-operation deadlines, retries for idempotent operations and a circuit breaker."""
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        retry: RetryPolicy | None = None,
+        deadlines: Dict[str, float] | None = None,
+        idempotent: FrozenSet[str] = IDEMPOTENT_OPERATIONS,
+        is_transient: Callable[[BaseException], bool] = is_transient_error,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.breaker = breaker
+        self.retry = retry or RetryPolicy()
+        self.deadlines = dict(deadlines or {})
+        self.idempotent = idempotent
+        self._is_transient = is_transient
+        self._clock = clock
+        self._sleep = sleep
+
+    def deadline(self, operation: str) -> float | None:
+        return self.deadlines.get(operation)
+
+    def call(self, operation: str, fn: Callable[[], T]) -> T:
+        deadline = self.deadline(operation)
+        started = self._clock()
+        max_retries = self.retry.max_retries if operation in self.idempotent else 0
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            remaining = None if deadline is None else max(0.0, deadline - (self._clock() - started))
+            token = _attempt_timeout.set(remaining)
+            recorded = False
+            try:
+                result = fn()
+            except Exception as exc:
+                if not self._is_transient(exc):
+                    # Client-side errors say nothing about backend health
+                    raise
+                self.breaker.record_failure()
+                recorded = True
+                metrics.incr(f"firestore.{operation}.failures")
+                delay = self.retry.backoff(attempt)
+                out_of_time = deadline is not None and self._clock() - started + delay >= deadline
+                if attempt >= max_retries or out_of_time:
+                    raise BackendUnavailableError(f"Firestore {operation} failed: {exc}") from exc
+            else:
+                self.breaker.record_success()
+                recorded = True
+                return result
+            finally:
+                _attempt_timeout.reset(token)
+                if not recorded:
+                    # Also reached on BaseException: never leave a half-open probe marked in flight
+                    self.breaker.release_probe()
+            attempt += 1
+            metrics.incr(f"firestore.{operation}.retries")
+            self._sleep(delay)
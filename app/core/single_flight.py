@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+from app.core.metrics import metrics
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class _AsyncCall:
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Share one in-flight execution among concurrent callers using the same key.
+
+    Results are only shared while the call is running; nothing is cached afterwards.
+    """
+
+    def __init__(self, name: str = "singleflight") -> None:
+        self._name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Hashable, _AsyncCall] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run `fn` once for all threads asking for `key` at the same time."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            metrics.incr(f"{self._name}.coalesced")
+            call.done.wait()
+        else:
+            metrics.incr(f"{self._name}.executed")
+            try:
+                call.result = fn()
+            except BaseException as exc:
+                call.error = exc
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Async variant: `fn` is blocking and runs once in a worker thread.
+
+        The worker thread goes through `do`, so async callers also join flights
+        started by threadpool handlers.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        call = self._async_calls.get(flight_key)
+        if call is None:
+            # The shared call is a task of its own: cancelling one caller (e.g. a client
+            # disconnect) does not cancel the call the other callers are waiting for
+            task = loop.create_task(asyncio.to_thread(self.do, key, fn))
+            call = self._async_calls[flight_key] = _AsyncCall(task)
+            call.task.add_done_callback(lambda _: self._forget(flight_key, call))
+        else:
+            metrics.incr(f"{self._name}.coalesced")
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every caller gave up: stop waiting for the result and let new callers start afresh
+                call.task.cancel()
+                self._forget(flight_key, call)
+
+    def _forget(self, flight_key: Hashable, call: _AsyncCall) -> None:
+        if self._async_calls.get(flight_key) is call:
+            del self._async_calls[flight_key]
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List
+
+
+@dataclass
+class ExportJob:
+    id: str
+    format: str
+    status: str  # pending | running | succeeded | failed
+    created_at: datetime
+    include_archived: bool = False
+    fields: List[str] | None = None
+    rows_written: int = 0
+    bytes_written: int = 0
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    # Local file path or gs:// URI of the finished export
+    location: str | None = None
+    error: str | None = None
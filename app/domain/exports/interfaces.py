@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import Any, Protocol
+
+from app.domain.exports.entities import ExportJob
+
+
+class ExportJobRepository(Protocol):
+    def create(self, job: ExportJob) -> ExportJob:
+        ...
+
+    def get(self, job_id: str) -> ExportJob | None:
+        ...
+
+    def update(self, job_id: str, changes: dict[str, Any]) -> None:
+        ...
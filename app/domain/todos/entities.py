@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Any
 
 
-@dataclass
+# Slotted: no per-instance __dict__, which matters when listing or exporting many todos.
+# Frozen: entities can be shared between coalesced callers without defensive copies.
+@dataclass(frozen=True, slots=True)
 class TodoEntity:
     id: str
     title: str
@@ -12,3 +15,10 @@ class TodoEntity:
     completed: bool
     created_at: datetime
     updated_at: datetime
+
+
+@dataclass(frozen=True)
+class ArchiveBatch:
+    moved: int
+    # Opaque position to pass back for the next batch; None once every candidate was scanned
+    cursor: Any | None
@@ -2,16 +2,26 @@ from __future__ import annotations
 
 from dataclasses import asdict
 from datetime import datetime
-from typing import List, Protocol
+from typing import Any, Iterator, List, Protocol, Sequence
 
-from app.domain.todos.entities import TodoEntity
+from app.domain.todos.entities import ArchiveBatch, TodoEntity
 
 
 class TodoRepository(Protocol):
-    def list(self) -> List[TodoEntity]:
+    # `fields` restricts which fields are read from storage; missing ones get defaults.
+    # `include_archived` also reads todos moved to the archive by `archive_batch`.
+    def list(self, fields: Sequence[str] | None = None, include_archived: bool = False) -> List[TodoEntity]:
         ...
 
-    def get(self, todo_id: str) -> TodoEntity | None:
+    def get(
+        self, todo_id: str, fields: Sequence[str] | None = None, include_archived: bool = False
+    ) -> TodoEntity | None:
+        ...
+
+    def iter_pages(
+        self, page_size: int = 500, fields: Sequence[str] | None = None, include_archived: bool = False
+    ) -> Iterator[List[TodoEntity]]:
+        # Stream every todo in created_at order, one page at a time (storage cursors)
         ...
 
     def create(self, title: str, description: str | None, completed: bool, now: datetime) -> TodoEntity:
@@ -23,6 +33,13 @@ class TodoRepository(Protocol):
     def delete(self, todo_id: str) -> bool:
         ...
 
+    def archive_batch(
+        self, cutoff: datetime, now: datetime, batch_size: int = 200, cursor: Any | None = None
+    ) -> ArchiveBatch:
+        # Move one batch of todos completed and untouched since `cutoff` to the archive.
+        # Start with cursor=None and pass each returned cursor back until it is None.
+        ...
+
 
 def entity_to_dict(entity: TodoEntity) -> dict:
     # Helper to convert entity to plain dict if ever needed
@@ -1,15 +1,71 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+import logging
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse
 from starlette.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.firestore import firestore_calls, firestore_resilience, get_firestore_client
+from app.core.logging import setup_logging, shutdown_logging
+from app.core.metrics import metrics
+from app.core.rate_limit import build_rate_limit_backend, retry_after_header
+from app.core.resilience import BackendUnavailableError, CircuitBreaker
+from app.api.routers.exports import router as exports_router, shutdown_exports
 from app.api.routers.todos import router as todos_router
+from app.middlewares.access_log import AccessLogMiddleware
+from app.middlewares.load_shedding import LoadSheddingMiddleware
+from app.middlewares.rate_limit import RateLimitMiddleware
 from app.middlewares.request_id import RequestIdMiddleware
 from app.middlewares.security_headers import SecurityHeadersMiddleware
 
-app = FastAPI(title="TODO SaaS Backend")
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Records are formatted and written by a background thread, off the request path
+    log_listener = setup_logging(settings.log_level, settings.log_queue_size)
+    # Sync handlers run in anyio's threadpool; size it to the calls Firestore can serve at once
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = settings.threadpool_size or settings.firestore_max_concurrent_calls
+    if settings.firestore_warmup:
+        # Pay the SDK import and client setup before serving instead of on the first request
+        await anyio.to_thread.run_sync(get_firestore_client)
+    yield
+    # No write_buffer flush needed: a PUT is answered only after its write, and the server
+    # drains in-flight requests (each write is issued at the end of its window) before this runs
+    # Running exports stop at the next page and are marked failed
+    await anyio.to_thread.run_sync(shutdown_exports)
+    shutdown_logging(log_listener)
+
+
+app = FastAPI(title="TODO SaaS Backend", lifespan=lifespan)
+
+# Protect Firestore and the worker threadpool: per-client limits first, then load shedding.
+# Added before CORS so rejected responses still carry CORS headers.
+app.add_middleware(
+    LoadSheddingMiddleware,
+    in_flight=lambda: firestore_calls.in_flight,
+    max_in_flight=settings.load_shed_max_inflight,
+    retry_after_seconds=settings.load_shed_retry_after_seconds,
+    exempt_paths=settings.rate_limit_exempt_paths,
+)
+if settings.rate_limit_enabled:
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=build_rate_limit_backend(settings.rate_limit_backend, settings.rate_limit_redis_url),
+        default_rule=settings.rate_limit_default,
+        routes=settings.rate_limit_routes,
+        api_key_header=settings.rate_limit_api_key_header,
+        api_keys=settings.rate_limit_api_keys,
+        trust_forwarded_for=settings.rate_limit_trust_forwarded_for,
+        trusted_proxy_hops=settings.rate_limit_trusted_proxy_hops,
+        exempt_paths=settings.rate_limit_exempt_paths,
+    )
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,14 +75,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add basic middlewares for observability and security
+# Add basic middlewares for observability and security.
+# The access log sits inside RequestId (so it sees the id) and outside the limiters (so it logs 429/503).
+if settings.access_log_enabled:
+    app.add_middleware(
+        AccessLogMiddleware,
+        sample_rate=settings.access_log_sample_rate,
+        route_sample_rates=settings.access_log_sample_rates,
+        slow_ms=settings.access_log_slow_ms,
+    )
 app.add_middleware(RequestIdMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
 
 
+@app.exception_handler(BackendUnavailableError)
+async def backend_unavailable_handler(request: Request, exc: BackendUnavailableError):
+    logger.warning("Backend unavailable: %s", exc)
+    return JSONResponse(
+        {"detail": "Backend unavailable, retry later"},
+        status_code=503,
+        headers={"Retry-After": retry_after_header(exc.retry_after)},
+    )
+
+
 @app.get("/health")
 async def health():
-    return {"status": "ok", "env": settings.app_env}
+    circuit = firestore_resilience.breaker.state
+    return {
+        "status": "ok" if circuit == CircuitBreaker.CLOSED else "degraded",
+        "env": settings.app_env,
+        "firestore": {"circuit": circuit, "in_flight": firestore_calls.in_flight},
+    }
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -195,3 +279,4 @@ async def index():
 
 
 app.include_router(todos_router)
+app.include_router(exports_router)
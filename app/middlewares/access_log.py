@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+from typing import Callable, Dict, Tuple
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.types import ASGIApp
+
+from app.core.metrics import metrics
+from app.core.request_context import RequestStats, request_stats_var
+
+access_logger = logging.getLogger("app.access")
+
+
+class AccessLogMiddleware(BaseHTTPMiddleware):
+    """Log one structured line per request: route, status, latency and Firestore calls.
+
+    Successful, fast requests are sampled per route; 5xx responses and requests slower
+    than `slow_ms` are always logged. Each line carries the `sample_rate` it was kept at.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 1.0,
+        route_sample_rates: Dict[str, float] | None = None,
+        slow_ms: float = 1000.0,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        super().__init__(app)
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self._rng = rng
+        # Keys are "[METHOD ]/route/template", as for rate_limit_routes
+        self._rates: Dict[Tuple[str | None, str], float] = {}
+        for pattern, rate in (route_sample_rates or {}).items():
+            method, _, path = pattern.rpartition(" ")
+            self._rates[(method.upper() or None, path)] = rate
+
+    def _rate_for(self, method: str, route: str) -> float:
+        rate = self._rates.get((method, route))
+        if rate is None:
+            rate = self._rates.get((None, route), self.sample_rate)
+        return rate
+
+    async def dispatch(self, request: Request, call_next):
+        stats = RequestStats()
+        token = request_stats_var.set(stats)
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            request_stats_var.reset(token)
+            self._log(request, status, (time.perf_counter() - started) * 1000, stats.firestore_ops)
+
+    def _log(self, request: Request, status: int, latency_ms: float, firestore_ops: int) -> None:
+        # The router stores the matched route in the (shared) scope; unmatched paths log route=null
+        route = getattr(request.scope.get("route"), "path", None)
+        method = request.method
+        rate = 1.0
+        if status < 500 and latency_ms < self.slow_ms:
+            rate = self._rate_for(method, route or request.url.path)
+            if rate < 1.0 and self._rng() >= rate:
+                metrics.incr("access_log.sampled_out")
+                return
+        access_logger.log(
+            logging.ERROR if status >= 500 else logging.INFO,
+            "%s %s %d",
+            method,
+            request.url.path,
+            status,
+            extra={
+                "method": method,
+                "path": request.url.path,
+                "route": route,
+                "status": status,
+                "latency_ms": round(latency_ms, 2),
+                "firestore_ops": firestore_ops,
+                "sample_rate": rate,
+            },
+        )
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp
+
+from app.core.metrics import metrics
+
+
+class LoadSheddingMiddleware(BaseHTTPMiddleware):
+    """Fail fast with 503 while the number of in-flight backend calls is above a threshold."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        in_flight: Callable[[], int],
+        max_in_flight: int,
+        retry_after_seconds: int = 1,
+        exempt_paths: Iterable[str] = (),
+    ) -> None:
+        super().__init__(app)
+        self.in_flight = in_flight
+        self.max_in_flight = max_in_flight
+        self.retry_after_seconds = retry_after_seconds
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def dispatch(self, request: Request, call_next):
+        if (
+            self.max_in_flight > 0
+            and request.url.path not in self.exempt_paths
+            and self.in_flight() >= self.max_in_flight
+        ):
+            metrics.incr("load_shed.rejected")
+            return JSONResponse(
+                {"detail": "Service overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after_seconds)},
+            )
+        return await call_next(request)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Tuple
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp
+
+from app.core.metrics import metrics
+from app.core.rate_limit import RateLimitBackend, RateLimitRule, retry_after_header
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """Reject clients that exceed their token bucket with 429 and `Retry-After`."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: RateLimitBackend,
+        default_rule: RateLimitRule,
+        routes: Dict[str, RateLimitRule] | None = None,
+        api_key_header: str = "X-API-Key",
+        api_keys: Iterable[str] = (),
+        trust_forwarded_for: bool = False,
+        trusted_proxy_hops: int = 1,
+        exempt_paths: Iterable[str] = (),
+    ) -> None:
+        super().__init__(app)
+        self.backend = backend
+        self.default_rule = default_rule
+        self.api_key_header = api_key_header
+        self.api_keys = frozenset(api_keys)
+        self.trust_forwarded_for = trust_forwarded_for
+        self.trusted_proxy_hops = max(1, trusted_proxy_hops)
+        self.exempt_paths = frozenset(exempt_paths)
+        self._exact: Dict[Tuple[str | None, str], RateLimitRule] = {}
+        self._prefixes: list[Tuple[str | None, str, RateLimitRule]] = []
+        for pattern, rule in (routes or {}).items():
+            method, _, path = pattern.rpartition(" ")
+            method = method.upper() or None
+            if path.endswith("*"):
+                self._prefixes.append((method, path[:-1], rule))
+            else:
+                self._exact[(method, path)] = rule
+        # Longest prefix wins
+        self._prefixes.sort(key=lambda item: len(item[1]), reverse=True)
+
+    def _match(self, method: str, path: str) -> Tuple[str, RateLimitRule]:
+        for key in ((method, path), (None, path)):
+            rule = self._exact.get(key)
+            if rule is not None:
+                return f"{key[0] or '*'} {path}", rule
+        for rule_method, prefix, rule in self._prefixes:
+            if (rule_method is None or rule_method == method) and path.startswith(prefix):
+                return f"{rule_method or '*'} {prefix}*", rule
+        return "default", self.default_rule
+
+    def _client_key(self, request: Request) -> str:
+        # Only known keys get their own bucket: unchecked keys could be rotated to dodge the limit
+        api_key = request.headers.get(self.api_key_header)
+        if api_key and api_key in self.api_keys:
+            return f"key:{api_key}"
+        if self.trust_forwarded_for:
+            # Proxies append to X-Forwarded-For and the client controls everything before
+            # them: take the address added by the outermost of our own proxies
+            entries = [e.strip() for e in request.headers.get("X-Forwarded-For", "").split(",") if e.strip()]
+            if entries:
+                return f"ip:{entries[-min(self.trusted_proxy_hops, len(entries))]}"
+        host = request.client.host if request.client else "unknown"
+        return f"ip:{host}"
+
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path in self.exempt_paths or request.method == "OPTIONS":
+            return await call_next(request)
+        route_key, rule = self._match(request.method, request.url.path)
+        decision = await self.backend.acquire(f"{route_key}|{self._client_key(request)}", rule)
+        if not decision.allowed:
+            metrics.incr("rate_limit.limited")
+            return JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": retry_after_header(decision.retry_after)},
+            )
+        metrics.incr("rate_limit.allowed")
+        response = await call_next(request)
+        response.headers.setdefault("X-RateLimit-Limit", str(rule.burst))
+        response.headers.setdefault("X-RateLimit-Remaining", str(decision.remaining))
+        return response
@@ -5,6 +5,8 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 from starlette.requests import Request
 
+from app.core.request_context import request_id_var
+
 
 class RequestIdMiddleware(BaseHTTPMiddleware):
     """Attach a unique request ID to every incoming request via headers and scope."""
@@ -16,6 +18,11 @@ class RequestIdMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         request_id = request.headers.get(self.header_name) or str(uuid.uuid4())
         request.state.request_id = request_id
-        response = await call_next(request)
+        # Picked up by log records emitted while serving this request
+        token = request_id_var.set(request_id)
+        try:
+            response = await call_next(request)
+        finally:
+            request_id_var.reset(token)
         response.headers[self.header_name] = request_id
         return response
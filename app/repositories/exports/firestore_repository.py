@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from app.core.firestore import firestore_calls, get_firestore_client
+from app.domain.exports.entities import ExportJob
+from app.domain.exports.interfaces import ExportJobRepository
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+
+_COLLECTION = "export_jobs"
+
+
+class FirestoreExportJobRepository(ExportJobRepository):
+    # Job state lives in Firestore so any worker can report progress of a job run by another
+    def __init__(self, client: firestore.Client | None = None) -> None:
+        self._client = client or get_firestore_client()
+
+    @property
+    def _collection(self) -> firestore.CollectionReference:
+        return self._client.collection(_COLLECTION)
+
+    def create(self, job: ExportJob) -> ExportJob:
+        data = asdict(job)
+        data.pop("id")
+        with firestore_calls.track():
+            self._collection.document(job.id).set(data)
+        return job
+
+    def get(self, job_id: str) -> ExportJob | None:
+        with firestore_calls.track():
+            snap = self._collection.document(job_id).get()
+        if not snap.exists:
+            return None
+        return ExportJob(id=snap.id, **(snap.to_dict() or {}))
+
+    def update(self, job_id: str, changes: dict[str, Any]) -> None:
+        with firestore_calls.track():
+            self._collection.document(job_id).update(changes)
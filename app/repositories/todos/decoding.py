@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterable, List, Mapping
+
+from app.domain.todos.entities import TodoEntity
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+
+_EMPTY: Mapping[str, Any] = {}
+
+
+def snapshot_data(snap: firestore.DocumentSnapshot) -> Mapping[str, Any]:
+    """Read-only view of a snapshot's fields.
+
+    `DocumentSnapshot.to_dict()` deep-copies the already decoded fields on every call.
+    Todo fields are immutable scalars (str, bool, datetime), so entities can safely share
+    the snapshot's own values; `to_dict()` is only used for snapshot types without `_data`.
+    `_data` is private SDK state: the google-cloud-firestore upper bound in pyproject.toml
+    covers the versions this was checked against.
+    """
+    data = getattr(snap, "_data", None)
+    if data is None:
+        data = snap.to_dict()
+    return data or _EMPTY
+
+
+def decode_entity(todo_id: str, data: Mapping[str, Any]) -> TodoEntity:
+    get = data.get
+    return TodoEntity(
+        id=todo_id,
+        title=get("title", ""),
+        description=get("description"),
+        completed=bool(get("completed", False)),
+        created_at=get("created_at"),
+        updated_at=get("updated_at"),
+    )
+
+
+def decode_snapshot(snap: firestore.DocumentSnapshot) -> TodoEntity:
+    return decode_entity(snap.id, snapshot_data(snap))
+
+
+def decode_snapshots(snaps: Iterable[firestore.DocumentSnapshot]) -> List[TodoEntity]:
+    return [decode_entity(snap.id, snapshot_data(snap)) for snap in snaps]
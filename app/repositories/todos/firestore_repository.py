@@ -1,54 +1,176 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import List
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from collections import ChainMap
+from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Sequence
 
-from google.cloud import firestore
-
-from app.core.firestore import get_firestore_client
-from app.domain.todos.entities import TodoEntity
+from app.core.firestore import firestore_calls, get_firestore_client
+from app.core.resilience import attempt_timeout
+from app.domain.todos.entities import ArchiveBatch, TodoEntity
 from app.domain.todos.interfaces import TodoRepository
+from app.repositories.todos.decoding import decode_entity, decode_snapshot, decode_snapshots, snapshot_data
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
 
 
 _COLLECTION = "todos"
+ARCHIVE_COLLECTION = "todos_archive"
+
+# An archive move is 2 writes (set + delete); Firestore allows 500 writes per transaction
+MAX_ARCHIVE_BATCH = 250
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _fanout_executor() -> ThreadPoolExecutor:
+    # Shared by all requests; collection reads are I/O bound so threads are enough
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="todo-fanout")
+        return _executor
+
 
+def merge_ordered(partitions: Iterable[List[TodoEntity]]) -> List[TodoEntity]:
+    """K-way merge of per-collection lists already sorted by `created_at`."""
+    return list(heapq.merge(*partitions, key=lambda e: (e.created_at, e.id)))
 
-def _doc_to_entity(doc: firestore.DocumentSnapshot) -> TodoEntity:
-    data = doc.to_dict() or {}
-    return TodoEntity(
-        id=doc.id,
-        title=data.get("title", ""),
-        description=data.get("description"),
-        completed=bool(data.get("completed", False)),
-        created_at=data.get("created_at"),
-        updated_at=data.get("updated_at"),
-    )
+
+def _field_paths(fields: Sequence[str] | None) -> List[str] | None:
+    # `id` is the document name, not a stored field
+    if fields is None:
+        return None
+    return [name for name in fields if name != "id"]
 
 
 class FirestoreTodoRepository(TodoRepository):
-    def __init__(self, client: firestore.Client | None = None) -> None:
+    def __init__(
+        self,
+        client: firestore.Client | None = None,
+        deadlines: Dict[str, float] | None = None,
+        archive_ttl: timedelta | None = None,
+    ) -> None:
         self._client = client or get_firestore_client()
+        self._deadlines = deadlines or {}
+        # When set, archived documents get an `expire_at` field for a Firestore TTL policy
+        self._archive_ttl = archive_ttl
+
+    def _call_options(self, operation: str) -> Dict[str, Any]:
+        # With a deadline the SDK call gets a timeout and its own retries are disabled,
+        # leaving retries to the resilience layer. Retried attempts only get the time left.
+        deadline = self._deadlines.get(operation)
+        remaining = attempt_timeout()
+        if remaining is not None:
+            deadline = remaining if deadline is None else min(deadline, remaining)
+        if deadline is None:
+            return {}
+        return {"timeout": deadline, "retry": None}
 
     @property
     def _collection(self) -> firestore.CollectionReference:
         return self._client.collection(_COLLECTION)
 
-    def list(self) -> List[TodoEntity]:
-        docs = (
-            self._collection
-            .order_by("created_at", direction=firestore.Query.ASCENDING)
-            .stream()
-        )
-        return [_doc_to_entity(doc) for doc in docs]
+    @property
+    def _archive_collection(self) -> firestore.CollectionReference:
+        return self._client.collection(ARCHIVE_COLLECTION)
+
+    # Storage layout hooks: subclasses can place documents elsewhere (see sharded_repository)
+
+    def _hot_collections(self) -> List[firestore.CollectionReference]:
+        return [self._collection]
 
-    def get(self, todo_id: str) -> TodoEntity | None:
-        snap = self._collection.document(todo_id).get()
+    def _document(self, todo_id: str) -> firestore.DocumentReference:
+        return self._collection.document(todo_id)
+
+    def _new_document(self) -> firestore.DocumentReference:
+        return self._collection.document()
+
+    def _read_ordered(
+        self, collection: firestore.CollectionReference, fields: Sequence[str] | None = None
+    ) -> List[TodoEntity]:
+        query = collection.order_by("created_at", direction="ASCENDING")
+        paths = _field_paths(fields)
+        if paths is not None:
+            # Projection: unrequested fields are never transferred from Firestore. created_at is
+            # always read: merging several collections (shards, archive) orders by it.
+            query = query.select(sorted(set(paths) | {"created_at"}))
+        docs = query.stream(**self._call_options("list"))
+        with firestore_calls.track():
+            return decode_snapshots(docs)
+
+    def list(self, fields: Sequence[str] | None = None, include_archived: bool = False) -> List[TodoEntity]:
+        collections = self._hot_collections()
+        if include_archived:
+            collections.append(self._archive_collection)
+        if len(collections) == 1:
+            return self._read_ordered(collections[0], fields)
+        # Read every source in parallel and merge them in created_at order. Each read runs in
+        # a copy of the caller's context so its Firestore calls count towards this request.
+        read = partial(self._read_ordered, fields=fields)
+        executor = _fanout_executor()
+        futures = [executor.submit(copy_context().run, read, collection) for collection in collections]
+        return merge_ordered(future.result() for future in futures)
+
+    def _iter_collection(
+        self, collection: firestore.CollectionReference, page_size: int, fields: Sequence[str] | None
+    ) -> Iterator[TodoEntity]:
+        query = collection.order_by("created_at", direction="ASCENDING").limit(page_size)
+        paths = _field_paths(fields)
+        if paths is not None:
+            # The cursor snapshot must carry the order_by field
+            query = query.select(sorted(set(paths) | {"created_at"}))
+        last = None
+        while True:
+            page_query = query.start_after(last) if last is not None else query
+            with firestore_calls.track():
+                snaps = list(page_query.stream(**self._call_options("list")))
+            yield from decode_snapshots(snaps)
+            if len(snaps) < page_size:
+                return
+            last = snaps[-1]
+
+    def iter_pages(
+        self, page_size: int = 500, fields: Sequence[str] | None = None, include_archived: bool = False
+    ) -> Iterator[List[TodoEntity]]:
+        collections = self._hot_collections()
+        if include_archived:
+            collections.append(self._archive_collection)
+        streams = [self._iter_collection(c, page_size, fields) for c in collections]
+        # Lazy k-way merge: at most one page per collection is held in memory
+        entities = streams[0] if len(streams) == 1 else heapq.merge(*streams, key=lambda e: (e.created_at, e.id))
+        page: List[TodoEntity] = []
+        for entity in entities:
+            page.append(entity)
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def get(
+        self, todo_id: str, fields: Sequence[str] | None = None, include_archived: bool = False
+    ) -> TodoEntity | None:
+        options = self._call_options("get")
+        paths = _field_paths(fields)
+        if paths is not None:
+            options["field_paths"] = paths
+        with firestore_calls.track():
+            snap = self._document(todo_id).get(**options)
+            if not snap.exists and include_archived:
+                snap = self._archive_collection.document(todo_id).get(**options)
         if not snap.exists:
             return None
-        return _doc_to_entity(snap)
+        return decode_snapshot(snap)
 
     def create(self, title: str, description: str | None, completed: bool, now: datetime) -> TodoEntity:
-        doc_ref = self._collection.document()
+        doc_ref = self._new_document()
         data = {
             "title": title,
             "description": description,
@@ -56,7 +178,8 @@ class FirestoreTodoRepository(TodoRepository):
             "created_at": now,
             "updated_at": now,
         }
-        doc_ref.set(data)
+        with firestore_calls.track():
+            doc_ref.set(data, **self._call_options("create"))
         return TodoEntity(
             id=doc_ref.id,
             title=title,
@@ -67,27 +190,72 @@ class FirestoreTodoRepository(TodoRepository):
         )
 
     def update(self, todo_id: str, updates: dict, now: datetime) -> TodoEntity | None:
-        doc_ref = self._collection.document(todo_id)
-        snap = doc_ref.get()
+        doc_ref = self._document(todo_id)
+        with firestore_calls.track():
+            snap = doc_ref.get(**self._call_options("update"))
         if not snap.exists:
             return None
-        updates = dict(updates)
-        updates["updated_at"] = now
-        doc_ref.update(updates)
-        current = snap.to_dict() or {}
-        current.update(updates)
-        return TodoEntity(
-            id=todo_id,
-            title=current.get("title", ""),
-            description=current.get("description"),
-            completed=bool(current.get("completed", False)),
-            created_at=current.get("created_at"),
-            updated_at=current.get("updated_at"),
-        )
+        changes = {**updates, "updated_at": now}
+        with firestore_calls.track():
+            doc_ref.update(changes, **self._call_options("update"))
+        # Post-image: the changes layered over the snapshot's fields, without copying either
+        return decode_entity(todo_id, ChainMap(changes, snapshot_data(snap)))
 
     def delete(self, todo_id: str) -> bool:
-        doc_ref = self._collection.document(todo_id)
-        if not doc_ref.get().exists:
-            return False
-        doc_ref.delete()
+        doc_ref = self._document(todo_id)
+        with firestore_calls.track():
+            if not doc_ref.get(**self._call_options("delete")).exists:
+                return False
+            doc_ref.delete(**self._call_options("delete"))
         return True
+
+    def archive_batch(
+        self, cutoff: datetime, now: datetime, batch_size: int = 200, cursor: Any | None = None
+    ) -> ArchiveBatch:
+        from google.cloud import firestore
+        from google.cloud.firestore_v1.base_query import FieldFilter
+
+        batch_size = max(1, min(batch_size, MAX_ARCHIVE_BATCH))
+
+        @firestore.transactional
+        def move(transaction: firestore.Transaction, refs: List[firestore.DocumentReference]) -> int:
+            moved = 0
+            for snap in self._client.get_all(refs, transaction=transaction):
+                data = snap.to_dict() if snap.exists else None
+                # Re-check inside the transaction: the todo may have been reopened or edited
+                if not data or not data.get("completed"):
+                    continue
+                if data.get("updated_at") is None or data["updated_at"] >= cutoff:
+                    continue
+                data["archived_at"] = now
+                if self._archive_ttl is not None:
+                    data["expire_at"] = now + self._archive_ttl
+                transaction.set(self._archive_collection.document(snap.id), data)
+                transaction.delete(snap.reference)
+                moved += 1
+            return moved
+
+        # The cursor is (index of the hot collection, last candidate scanned in it). Candidates
+        # the re-check skipped stay in place, so the next batch starts after them, not over.
+        collections = self._hot_collections()
+        index, last = cursor if cursor is not None else (0, None)
+        # Needs a composite index on (completed, updated_at)
+        query = (
+            collections[index]
+            .where(filter=FieldFilter("completed", "==", True))
+            .where(filter=FieldFilter("updated_at", "<", cutoff))
+            .order_by("updated_at")
+            .limit(batch_size)
+        )
+        if last is not None:
+            query = query.start_after(last)
+        moved = 0
+        with firestore_calls.track():
+            snaps = list(query.stream(**self._call_options("archive")))
+            if snaps:
+                moved = move(self._client.transaction(), [snap.reference for snap in snaps])
+        if len(snaps) == batch_size:
+            return ArchiveBatch(moved=moved, cursor=(index, snaps[-1]))
+        if index + 1 < len(collections):
+            return ArchiveBatch(moved=moved, cursor=(index + 1, None))
+        return ArchiveBatch(moved=moved, cursor=None)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterator, List, Sequence
+
+from app.core.resilience import ResiliencePolicy
+from app.domain.todos.entities import ArchiveBatch, TodoEntity
+from app.domain.todos.interfaces import TodoRepository
+
+
+class ResilientTodoRepository(TodoRepository):
+    """Decorate any repository with the deadlines, retries and circuit breaker of a policy."""
+
+    def __init__(self, inner: TodoRepository, policy: ResiliencePolicy) -> None:
+        self._inner = inner
+        self._policy = policy
+
+    def list(self, fields: Sequence[str] | None = None, include_archived: bool = False) -> List[TodoEntity]:
+        return self._policy.call("list", lambda: self._inner.list(fields=fields, include_archived=include_archived))
+
+    def get(
+        self, todo_id: str, fields: Sequence[str] | None = None, include_archived: bool = False
+    ) -> TodoEntity | None:
+        return self._policy.call(
+            "get", lambda: self._inner.get(todo_id, fields=fields, include_archived=include_archived)
+        )
+
+    def iter_pages(
+        self, page_size: int = 500, fields: Sequence[str] | None = None, include_archived: bool = False
+    ) -> Iterator[List[TodoEntity]]:
+        # Every page fetch is one breaker-guarded call whose outcome is recorded, so a scan never
+        # holds the half-open probe between pages. "export" is not idempotent: a scan cannot
+        # resume after an error, so a failed page ends the export instead of being retried.
+        pages: Iterator[List[TodoEntity]] | None = None
+
+        def next_page() -> List[TodoEntity] | None:
+            nonlocal pages
+            if pages is None:
+                pages = iter(
+                    self._inner.iter_pages(page_size=page_size, fields=fields, include_archived=include_archived)
+                )
+            return next(pages, None)
+
+        while True:
+            page = self._policy.call("export", next_page)
+            if page is None:
+                return
+            yield page
+
+    def create(self, title: str, description: str | None, completed: bool, now: datetime) -> TodoEntity:
+        return self._policy.call(
+            "create",
+            lambda: self._inner.create(title=title, description=description, completed=completed, now=now),
+        )
+
+    def update(self, todo_id: str, updates: dict, now: datetime) -> TodoEntity | None:
+        return self._policy.call("update", lambda: self._inner.update(todo_id=todo_id, updates=updates, now=now))
+
+    def delete(self, todo_id: str) -> bool:
+        return self._policy.call("delete", lambda: self._inner.delete(todo_id))
+
+    def archive_batch(
+        self, cutoff: datetime, now: datetime, batch_size: int = 200, cursor: Any | None = None
+    ) -> ArchiveBatch:
+        # One call per batch: a transient error retries that batch instead of the whole run
+        return self._policy.call(
+            "archive",
+            lambda: self._inner.archive_batch(cutoff=cutoff, now=now, batch_size=batch_size, cursor=cursor),
+        )
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import zlib
+from datetime import timedelta
+from typing import TYPE_CHECKING, Dict, List
+
+from app.repositories.todos.firestore_repository import _COLLECTION, FirestoreTodoRepository
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+
+SHARDS_COLLECTION = "todo_shards"
+
+
+def shard_for(todo_id: str, shard_count: int) -> int:
+    # Stable across processes and Python versions (unlike hash())
+    return zlib.crc32(todo_id.encode("utf-8")) % shard_count
+
+
+def shard_path(shard: int) -> str:
+    return f"{SHARDS_COLLECTION}/{shard:03d}/{_COLLECTION}"
+
+
+class ShardedFirestoreTodoRepository(FirestoreTodoRepository):
+    """Spread todos over `todo_shards/{NNN}/todos` subcollections.
+
+    Index entries of a subcollection are prefixed by its parent path, so monotonically
+    increasing `created_at` values land in `shard_count` separate index ranges instead
+    of a single hot one. The shard is derived from the document id, so point reads and
+    writes need no extra lookup; listings fan out to every shard and merge in order.
+    """
+
+    def __init__(
+        self,
+        client: firestore.Client | None = None,
+        deadlines: Dict[str, float] | None = None,
+        archive_ttl: timedelta | None = None,
+        shard_count: int = 16,
+    ) -> None:
+        super().__init__(client=client, deadlines=deadlines, archive_ttl=archive_ttl)
+        if shard_count < 1:
+            raise ValueError("shard_count must be >= 1")
+        self._shard_count = shard_count
+
+    def _shard_collection(self, shard: int) -> firestore.CollectionReference:
+        return self._client.collection(shard_path(shard))
+
+    def _hot_collections(self) -> List[firestore.CollectionReference]:
+        # Listings and archival fan out to every shard; the archive itself stays flat
+        return [self._shard_collection(shard) for shard in range(self._shard_count)]
+
+    def _document(self, todo_id: str) -> firestore.DocumentReference:
+        return self._shard_collection(shard_for(todo_id, self._shard_count)).document(todo_id)
+
+    def _new_document(self) -> firestore.DocumentReference:
+        # Auto ids are generated client-side; pick the shard from the id afterwards
+        todo_id = self._collection.document().id
+        return self._document(todo_id)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class ExportCreate(BaseModel):
+    # Input schema to start a bulk export job
+    format: Literal["jsonl", "csv", "parquet"] = "jsonl"
+    include_archived: bool = False
+    fields: Optional[List[str]] = None
+
+
+class ExportRead(BaseModel):
+    # Job status returned to clients; download_url is set once the job succeeded
+    id: str
+    format: str
+    status: str
+    include_archived: bool
+    fields: Optional[List[str]] = None
+    rows_written: int
+    bytes_written: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
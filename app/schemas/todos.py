@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional, List
+from functools import lru_cache
+from typing import Any, Dict, Optional, List, Tuple, Type, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, create_model
 
 
 class TodoCreate(BaseModel):
@@ -30,6 +31,56 @@ class TodoRead(BaseModel):
     updated_at: datetime
 
 
+class TodoSparse(BaseModel):
+    # Output schema for `?fields=` projections: only the requested fields are present
+    id: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    completed: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
 class TodoPage(BaseModel):
-    items: List[TodoRead]
+    # Items are TodoSparse when the request used `?fields=`
+    items: List[Union[TodoRead, TodoSparse]]
     next_cursor: Optional[datetime] = None
+
+
+TODO_FIELDS: Tuple[str, ...] = tuple(TodoRead.model_fields)
+
+
+def parse_fields(raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse `?fields=title,completed` into known field names (`id` is always included)."""
+    if raw is None:
+        return None
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested - set(TODO_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    # Keep the canonical order so equivalent projections share cached models
+    return tuple(name for name in TODO_FIELDS if name in requested)
+
+
+@lru_cache(maxsize=None)
+def sparse_todo_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    # Trimmed copy of TodoRead: same types and validation, unrequested fields do not exist
+    definitions: Dict[str, Any] = {
+        name: (TodoRead.model_fields[name].annotation, TodoRead.model_fields[name]) for name in fields
+    }
+    return create_model("TodoRead_" + "_".join(fields), **definitions)
+
+
+@lru_cache(maxsize=None)
+def sparse_page_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    return create_model(
+        "TodoPage_" + "_".join(fields),
+        items=(List[sparse_todo_model(fields)], ...),
+        next_cursor=(Optional[datetime], None),
+    )
+
+
+@lru_cache(maxsize=None)
+def sparse_list_adapter(fields: Tuple[str, ...]) -> TypeAdapter:
+    return TypeAdapter(List[sparse_todo_model(fields)])
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import importlib.util
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from app.core.config import Settings
+
+APP_PATH = "app.main:app"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ServerOptions:
+    host: str
+    port: int
+    workers: int
+    loop: str
+    http: str
+    keepalive_timeout: int
+    graceful_timeout: int
+    backlog: int
+    preload: bool
+
+
+def available_cpus() -> int:
+    # Respect CPU affinity (containers, taskset) when the platform exposes it
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+def build_server_options(settings: Settings) -> ServerOptions:
+    workers = settings.server_workers or available_cpus()
+    return ServerOptions(
+        host=settings.server_host,
+        port=settings.app_port,
+        workers=workers,
+        loop="uvloop" if _has_module("uvloop") else "asyncio",
+        http="httptools" if _has_module("httptools") else "h11",
+        keepalive_timeout=settings.server_keepalive_timeout,
+        graceful_timeout=settings.server_graceful_timeout,
+        backlog=settings.server_backlog,
+        preload=settings.server_preload,
+    )
+
+
+def _serve_uvicorn(options: ServerOptions) -> None:
+    import uvicorn
+
+    uvicorn.run(
+        APP_PATH,
+        host=options.host,
+        port=options.port,
+        workers=options.workers,
+        loop=options.loop,
+        http=options.http,
+        timeout_keep_alive=options.keepalive_timeout,
+        timeout_graceful_shutdown=options.graceful_timeout,
+        backlog=options.backlog,
+        proxy_headers=True,
+        # Requests are logged by AccessLogMiddleware; uvicorn's own records go to the app's JSON log
+        access_log=False,
+        log_config=None,
+    )
+
+
+def _serve_gunicorn(options: ServerOptions) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    try:
+        from uvicorn_worker import UvicornWorker
+    except ImportError:
+        from uvicorn.workers import UvicornWorker
+
+    class TunedUvicornWorker(UvicornWorker):
+        CONFIG_KWARGS: Dict[str, Any] = {
+            "loop": options.loop,
+            "http": options.http,
+            "timeout_graceful_shutdown": options.graceful_timeout,
+            "proxy_headers": True,
+            "access_log": False,
+        }
+
+    class TodoApplication(BaseApplication):
+        def load_config(self) -> None:
+            config = {
+                "bind": f"{options.host}:{options.port}",
+                "workers": options.workers,
+                "worker_class": TunedUvicornWorker,
+                "keepalive": options.keepalive_timeout,
+                "graceful_timeout": options.graceful_timeout,
+                "backlog": options.backlog,
+                # Import the app once in the master so forked workers share its modules (copy-on-write)
+                "preload_app": options.preload,
+            }
+            for key, value in config.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+
+            return app
+
+    TodoApplication().run()
+
+
+def serve(settings: Settings) -> None:
+    options = build_server_options(settings)
+    if options.workers > 1 and _has_module("gunicorn"):
+        _serve_gunicorn(options)
+        return
+    if options.workers > 1 and options.preload:
+        logger.warning(
+            "gunicorn is not installed: workers are spawned without preloading the app "
+            "(install the 'server' extra to enable it)"
+        )
+    _serve_uvicorn(options)
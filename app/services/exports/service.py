@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Sequence
+
+from app.core.metrics import metrics
+from app.domain.exports.entities import ExportJob
+from app.domain.exports.interfaces import ExportJobRepository
+from app.domain.todos.interfaces import TodoRepository
+from app.services.exports.writers import EXPORT_FIELDS, check_format_available, file_extension, open_writer
+
+logger = logging.getLogger(__name__)
+
+
+class ExportInterrupted(Exception):
+    pass
+
+
+class ExportService:
+    """Run bulk exports in a dedicated background pool, away from the request threadpool.
+
+    Jobs page through the todo repository with storage cursors and stream each page to a
+    compressed file, so memory stays bounded by the page size. Finished files stay in
+    `export_dir` or are uploaded to `gs://{bucket}/{prefix}` when a bucket is configured.
+    """
+
+    def __init__(
+        self,
+        jobs: ExportJobRepository,
+        todos: Callable[[], TodoRepository],
+        executor: ThreadPoolExecutor,
+        export_dir: str,
+        page_size: int = 500,
+        bucket: str | None = None,
+        prefix: str = "exports/",
+    ) -> None:
+        self._jobs = jobs
+        self._todos = todos
+        self._executor = executor
+        self._export_dir = export_dir
+        self._page_size = page_size
+        self._bucket = bucket
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._running: Dict[str, Future] = {}
+        self._stopping = threading.Event()
+
+    def _now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def start_export(self, fmt: str, include_archived: bool = False, fields: Sequence[str] | None = None) -> ExportJob:
+        check_format_available(fmt)
+        job = ExportJob(
+            id=uuid.uuid4().hex,
+            format=fmt,
+            status="pending",
+            created_at=self._now(),
+            include_archived=include_archived,
+            fields=list(fields) if fields is not None else None,
+        )
+        self._jobs.create(job)
+        metrics.incr("exports.started")
+        with self._lock:
+            self._running[job.id] = self._executor.submit(self._run, job)
+        return job
+
+    def get_job(self, job_id: str) -> ExportJob | None:
+        return self._jobs.get(job_id)
+
+    def _run(self, job: ExportJob) -> None:
+        fields = tuple(job.fields) if job.fields else EXPORT_FIELDS
+        path = os.path.join(self._export_dir, job.id + file_extension(job.format))
+        rows = 0
+        try:
+            self._jobs.update(job.id, {"status": "running", "started_at": self._now()})
+            os.makedirs(self._export_dir, exist_ok=True)
+            last_progress = time.monotonic()
+            writer = open_writer(job.format, path, fields)
+            try:
+                pages = self._todos().iter_pages(
+                    page_size=self._page_size, fields=fields, include_archived=job.include_archived
+                )
+                for page in pages:
+                    if self._stopping.is_set():
+                        raise ExportInterrupted("Interrupted by shutdown")
+                    writer.write_page(page)
+                    rows += len(page)
+                    # Firestore contends on documents written more than about once per second
+                    if time.monotonic() - last_progress >= 1.0:
+                        self._jobs.update(job.id, {"rows_written": rows})
+                        last_progress = time.monotonic()
+            finally:
+                writer.close()
+            # Measured before uploading: the upload removes the local file
+            bytes_written = os.path.getsize(path)
+            location = self._upload(path, job) if self._bucket else path
+            self._jobs.update(
+                job.id,
+                {
+                    "status": "succeeded",
+                    "rows_written": rows,
+                    "bytes_written": bytes_written,
+                    "location": location,
+                    "finished_at": self._now(),
+                },
+            )
+            metrics.incr("exports.succeeded")
+        except Exception as exc:
+            logger.exception("Export %s failed", job.id)
+            # Never leave a truncated file behind for the download endpoint to serve
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.warning("Could not remove partial export %s", path, exc_info=True)
+            self._jobs.update(job.id, {"status": "failed", "error": str(exc), "finished_at": self._now()})
+            metrics.incr("exports.failed")
+        finally:
+            with self._lock:
+                self._running.pop(job.id, None)
+
+    def _upload(self, path: str, job: ExportJob) -> str:
+        from google.cloud import storage
+
+        blob_name = self._prefix + os.path.basename(path)
+        blob = storage.Client().bucket(self._bucket).blob(blob_name)
+        blob.upload_from_filename(path)
+        os.remove(path)
+        return f"gs://{self._bucket}/{blob_name}"
+
+    def download_url(self, job: ExportJob, expires: timedelta = timedelta(hours=1)) -> str | None:
+        """Signed URL for exports stored in GCS; None for local files (served by the API)."""
+        if not job.location or not job.location.startswith("gs://"):
+            return None
+        from google.cloud import storage
+
+        bucket, _, blob_name = job.location[len("gs://"):].partition("/")
+        try:
+            return storage.Client().bucket(bucket).blob(blob_name).generate_signed_url(
+                version="v4", expiration=expires, method="GET"
+            )
+        except Exception:
+            # Credentials without a signing key (e.g. user ADC) cannot sign; return the URI instead
+            return job.location
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """Stop running jobs between pages and mark queued ones as failed."""
+        self._stopping.set()
+        with self._lock:
+            running = dict(self._running)
+        for job_id, future in running.items():
+            if future.cancel():
+                self._jobs.update(job_id, {"status": "failed", "error": "Interrupted by shutdown"})
+        wait([f for f in running.values() if not f.cancelled()], timeout=timeout)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+from datetime import datetime
+from typing import Dict, List, Protocol, Sequence, Type
+
+from app.domain.todos.entities import TodoEntity
+
+EXPORT_FIELDS = ("id", "title", "description", "completed", "created_at", "updated_at")
+
+
+class ExportFormatUnavailable(Exception):
+    """The requested format needs an optional dependency that is not installed."""
+
+
+class ExportWriter(Protocol):
+    def write_page(self, entities: List[TodoEntity]) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value)!r}")
+
+
+class JsonLinesWriter:
+    extension = ".jsonl.gz"
+
+    def __init__(self, path: str, fields: Sequence[str]) -> None:
+        self._fields = tuple(fields)
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+
+    def write_page(self, entities: List[TodoEntity]) -> None:
+        lines = [
+            json.dumps({name: getattr(e, name) for name in self._fields}, default=_json_default)
+            for e in entities
+        ]
+        self._file.write("\n".join(lines) + "\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CsvWriter:
+    extension = ".csv.gz"
+
+    def __init__(self, path: str, fields: Sequence[str]) -> None:
+        self._fields = tuple(fields)
+        self._file = gzip.open(path, "wt", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self._fields)
+
+    def write_page(self, entities: List[TodoEntity]) -> None:
+        rows = []
+        for e in entities:
+            row = []
+            for name in self._fields:
+                value = getattr(e, name)
+                row.append(value.isoformat() if isinstance(value, datetime) else value)
+            rows.append(row)
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    """Columnar export through Arrow: each page becomes a row group."""
+
+    extension = ".parquet"
+
+    def __init__(self, path: str, fields: Sequence[str]) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ExportFormatUnavailable("Parquet exports require the 'pyarrow' package") from exc
+        types = {
+            "id": pa.string(),
+            "title": pa.string(),
+            "description": pa.string(),
+            "completed": pa.bool_(),
+            "created_at": pa.timestamp("us", tz="UTC"),
+            "updated_at": pa.timestamp("us", tz="UTC"),
+        }
+        self._pa = pa
+        self._fields = tuple(fields)
+        self._schema = pa.schema([(name, types[name]) for name in self._fields])
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write_page(self, entities: List[TodoEntity]) -> None:
+        columns = [[getattr(e, name) for e in entities] for name in self._fields]
+        self._writer.write_table(self._pa.Table.from_arrays(columns, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+WRITERS: Dict[str, Type] = {
+    "jsonl": JsonLinesWriter,
+    "csv": CsvWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def check_format_available(fmt: str) -> None:
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as exc:
+            raise ExportFormatUnavailable("Parquet exports require the 'pyarrow' package") from exc
+
+
+def open_writer(fmt: str, path: str, fields: Sequence[str]) -> ExportWriter:
+    return WRITERS[fmt](path, fields)
+
+
+def file_extension(fmt: str) -> str:
+    return WRITERS[fmt].extension
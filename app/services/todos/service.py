@@ -1,30 +1,116 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import List
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Callable, List, Sequence, Tuple, TypeVar
 
+from app.core.single_flight import SingleFlight
 from app.domain.todos.entities import TodoEntity
 from app.domain.todos.interfaces import TodoRepository
+from app.services.todos.write_buffer import WriteCoalescer
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(fields: Sequence[str] | None) -> Tuple[str, ...] | None:
+    # Hashable form so projections can be part of a single-flight key
+    return tuple(fields) if fields is not None else None
 
 
 class TodoService:
-    def __init__(self, repository: TodoRepository) -> None:
+    def __init__(
+        self,
+        repository: TodoRepository,
+        single_flight: SingleFlight | None = None,
+        write_buffer: WriteCoalescer | None = None,
+    ) -> None:
         self._repository = repository
+        # Optional: coalesce identical concurrent reads into one repository call
+        self._single_flight = single_flight
+        # Optional: merge rapid partial updates to the same todo into one write
+        self._write_buffer = write_buffer
 
     def _now(self) -> datetime:
         return datetime.now(timezone.utc)
 
-    def list_todos(self) -> List[TodoEntity]:
-        return self._repository.list()
+    def _coalesce(self, key: tuple, read: Callable[[], T]) -> T:
+        if self._single_flight is None:
+            return read()
+        return self._single_flight.do(key, read)
+
+    async def _coalesce_async(self, key: tuple, read: Callable[[], T]) -> T:
+        if self._single_flight is None:
+            return await asyncio.to_thread(read)
+        return await self._single_flight.do_async(key, read)
 
-    def get_todo(self, todo_id: str) -> TodoEntity | None:
-        return self._repository.get(todo_id)
+    def list_todos(self, fields: Sequence[str] | None = None, include_archived: bool = False) -> List[TodoEntity]:
+        fields = _freeze(fields)
+        return self._coalesce(
+            ("list_todos", fields, include_archived),
+            partial(self._repository.list, fields=fields, include_archived=include_archived),
+        )
+
+    def get_todo(
+        self, todo_id: str, fields: Sequence[str] | None = None, include_archived: bool = False
+    ) -> TodoEntity | None:
+        fields = _freeze(fields)
+        return self._coalesce(
+            ("get_todo", todo_id, fields, include_archived),
+            partial(self._repository.get, todo_id, fields=fields, include_archived=include_archived),
+        )
+
+    async def list_todos_async(
+        self, fields: Sequence[str] | None = None, include_archived: bool = False
+    ) -> List[TodoEntity]:
+        fields = _freeze(fields)
+        return await self._coalesce_async(
+            ("list_todos", fields, include_archived),
+            partial(self._repository.list, fields=fields, include_archived=include_archived),
+        )
+
+    async def get_todo_async(
+        self, todo_id: str, fields: Sequence[str] | None = None, include_archived: bool = False
+    ) -> TodoEntity | None:
+        fields = _freeze(fields)
+        return await self._coalesce_async(
+            ("get_todo", todo_id, fields, include_archived),
+            partial(self._repository.get, todo_id, fields=fields, include_archived=include_archived),
+        )
 
     def create_todo(self, title: str, description: str | None, completed: bool) -> TodoEntity:
         return self._repository.create(title=title, description=description, completed=completed, now=self._now())
 
     def update_todo(self, todo_id: str, updates: dict) -> TodoEntity | None:
-        return self._repository.update(todo_id=todo_id, updates=updates, now=self._now())
+        if self._write_buffer is None:
+            return self._repository.update(todo_id=todo_id, updates=updates, now=self._now())
+        return self._write_buffer.update(
+            todo_id,
+            updates,
+            lambda merged: self._repository.update(todo_id=todo_id, updates=merged, now=self._now()),
+        )
 
     def delete_todo(self, todo_id: str) -> bool:
         return self._repository.delete(todo_id)
+
+    def archive_completed_todos(self, older_than: timedelta, batch_size: int = 200) -> int:
+        now = self._now()
+        cutoff = now - older_than
+        moved = 0
+        cursor = None
+        # One repository call per batch, so a failure only loses the batch in flight
+        try:
+            while True:
+                batch = self._repository.archive_batch(
+                    cutoff=cutoff, now=now, batch_size=batch_size, cursor=cursor
+                )
+                moved += batch.moved
+                if batch.cursor is None:
+                    return moved
+                cursor = batch.cursor
+        except Exception:
+            logger.warning("Archival stopped after moving %d todos", moved)
+            raise
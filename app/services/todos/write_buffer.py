@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from app.core.metrics import metrics
+from app.domain.todos.entities import TodoEntity
+
+
+class _PendingWrite:
+    def __init__(self) -> None:
+        self.updates: Dict[str, Any] = {}
+        self.done = threading.Event()
+        self.result: TodoEntity | None = None
+        self.error: BaseException | None = None
+        # Batch still being written for the same todo; writes are applied in order
+        self.previous: _PendingWrite | None = None
+
+
+class WriteCoalescer:
+    """Merge partial updates to the same todo that arrive within a short window.
+
+    The first update for a todo waits `window` seconds; updates arriving meanwhile are
+    merged into it (later values win) and a single repository write is issued. Every
+    caller blocks until that write has completed and receives the same post-image, so
+    an update is never acknowledged before it is persisted: a crash can only lose
+    updates whose callers have not been answered yet.
+    """
+
+    def __init__(self, window: float, name: str = "todos.writes") -> None:
+        self.window = window
+        self._name = name
+        self._lock = threading.Lock()
+        self._pending: Dict[str, _PendingWrite] = {}
+        self._writing: Dict[str, _PendingWrite] = {}
+
+    def update(
+        self,
+        todo_id: str,
+        updates: Dict[str, Any],
+        write: Callable[[Dict[str, Any]], TodoEntity | None],
+    ) -> TodoEntity | None:
+        metrics.incr(f"{self._name}.requested")
+        with self._lock:
+            pending = self._pending.get(todo_id)
+            leader = pending is None
+            if leader:
+                pending = self._pending[todo_id] = _PendingWrite()
+                pending.previous = self._writing.get(todo_id)
+            pending.updates.update(updates)
+
+        if not leader:
+            metrics.incr(f"{self._name}.merged")
+            pending.done.wait()
+        else:
+            time.sleep(self.window)
+            with self._lock:
+                del self._pending[todo_id]
+                self._writing[todo_id] = pending
+                merged = dict(pending.updates)
+            if pending.previous is not None:
+                pending.previous.done.wait()
+                pending.previous = None
+            metrics.incr(f"{self._name}.issued")
+            try:
+                pending.result = write(merged)
+            except BaseException as exc:
+                pending.error = exc
+            finally:
+                with self._lock:
+                    if self._writing.get(todo_id) is pending:
+                        del self._writing[todo_id]
+                    pending.done.set()
+
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
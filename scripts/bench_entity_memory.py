@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+from google.cloud.firestore_v1.base_document import DocumentSnapshot
+from google.cloud.firestore_v1.document import DocumentReference
+
+from app.repositories.todos.decoding import decode_snapshots
+
+
+@dataclass
+class LegacyTodoEntity:
+    # The entity as it was before: a regular dataclass with a per-instance __dict__
+    id: str
+    title: str
+    description: str | None
+    completed: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+def legacy_decode(snaps: List[DocumentSnapshot]) -> List[LegacyTodoEntity]:
+    entities = []
+    for doc in snaps:
+        data = doc.to_dict() or {}
+        entities.append(
+            LegacyTodoEntity(
+                id=doc.id,
+                title=data.get("title", ""),
+                description=data.get("description"),
+                completed=bool(data.get("completed", False)),
+                created_at=data.get("created_at"),
+                updated_at=data.get("updated_at"),
+            )
+        )
+    return entities
+
+
+def build_snapshots(count: int) -> List[DocumentSnapshot]:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    snaps = []
+    for i in range(count):
+        ts = start + timedelta(seconds=i)
+        data = {
+            "title": f"todo {i}",
+            "description": "lorem ipsum dolor sit amet" if i % 2 else None,
+            "completed": i % 3 == 0,
+            "created_at": ts,
+            "updated_at": ts,
+        }
+        ref = DocumentReference("todos", f"doc{i:08d}", client=None)
+        snaps.append(DocumentSnapshot(ref, data, True, ts, ts, ts))
+    return snaps
+
+
+class GcTimer:
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.collections = 0
+        self._started = 0.0
+
+    def __call__(self, phase: str, info: Dict[str, int]) -> None:
+        if phase == "start":
+            self._started = time.perf_counter()
+        else:
+            self.total += time.perf_counter() - self._started
+            self.collections += 1
+
+
+def measure(decode: Callable[[List[DocumentSnapshot]], object], snaps: List[DocumentSnapshot]) -> Dict[str, float]:
+    # Timing and GC without tracemalloc, whose hooks slow allocation down considerably
+    gc.collect()
+    timer = GcTimer()
+    gc.callbacks.append(timer)
+    try:
+        started = time.perf_counter()
+        result = decode(snaps)
+        elapsed = time.perf_counter() - started
+    finally:
+        gc.callbacks.remove(timer)
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = decode(snaps)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {
+        "time_ms": elapsed * 1000,
+        "gc_ms": timer.total * 1000,
+        "gc_runs": timer.collections,
+        "retained_mb": current / 2**20,
+        "peak_mb": peak / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and GC cost of decoding Firestore snapshots into todos")
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    snaps = build_snapshots(args.count)
+    strategies = {
+        "legacy (to_dict + dataclass)": legacy_decode,
+        "slotted entities": decode_snapshots,
+    }
+    print(f"{args.count} documents")
+    print(f"{'strategy':30s} {'time':>9s} {'gc':>9s} {'gc runs':>8s} {'retained':>10s} {'peak':>10s}")
+    for name, decode in strategies.items():
+        r = measure(decode, snaps)
+        print(
+            f"{name:30s} {r['time_ms']:7.0f}ms {r['gc_ms']:7.1f}ms {r['gc_runs']:8d} "
+            f"{r['retained_mb']:8.1f}MB {r['peak_mb']:8.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
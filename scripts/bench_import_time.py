@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Modules that must stay out of the startup import graph
+HEAVY_MODULES = ("google.cloud.firestore", "google.api_core", "grpc", "pyarrow", "redis", "gunicorn")
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    # module -> (self us, cumulative us), parsed from `python -X importtime`
+    timings: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def total_ms(self) -> float:
+        return self.timings.get(self.module, (0, 0))[1] / 1000
+
+    def imported(self, prefix: str) -> List[str]:
+        return [name for name in self.timings if name == prefix or name.startswith(prefix + ".")]
+
+    def slowest(self, count: int = 15) -> List[Tuple[str, int]]:
+        return sorted(((name, cum) for name, (_, cum) in self.timings.items()), key=lambda x: -x[1])[:count]
+
+
+def measure_import_time(module: str = "app.main") -> ImportProfile:
+    # A fresh interpreter so nothing is cached from the current process
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = ImportProfile(module=module)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile.timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the import time of the app")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    profiles = [measure_import_time(args.module) for _ in range(args.runs)]
+    best = min(profiles, key=lambda p: p.total_ms)
+    print(f"{args.module}: best {best.total_ms:.1f} ms over {args.runs} runs")
+    for name, cumulative in best.slowest():
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    for prefix in HEAVY_MODULES:
+        if best.imported(prefix):
+            print(f"WARNING: {prefix} is imported at startup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from app.core.firestore import get_firestore_client
+from app.repositories.todos.firestore_repository import FirestoreTodoRepository
+from app.repositories.todos.sharded_repository import ShardedFirestoreTodoRepository
+
+
+def run(repository: FirestoreTodoRepository, count: int, concurrency: int) -> float:
+    def create(i: int) -> None:
+        repository.create(
+            title=f"bench {i}", description=None, completed=False, now=datetime.now(timezone.utc)
+        )
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(create, range(count)))
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sustained create throughput per storage layout")
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--layout", choices=["flat", "sharded", "both"], default="both")
+    args = parser.parse_args()
+
+    if not os.environ.get("FIRESTORE_EMULATOR_HOST"):
+        raise SystemExit(
+            "Set FIRESTORE_EMULATOR_HOST (gcloud emulators firestore start) to avoid writing to a real project"
+        )
+
+    # The emulator does not throttle hot index ranges like production does: use it to compare
+    # client-side overhead (fan-out, id generation) and run against a staging project for the real cap.
+    client = get_firestore_client()
+    layouts = {
+        "flat": FirestoreTodoRepository(client=client),
+        "sharded": ShardedFirestoreTodoRepository(client=client, shard_count=args.shards),
+    }
+    for name, repository in layouts.items():
+        if args.layout not in (name, "both"):
+            continue
+        rate = run(repository, args.count, args.concurrency)
+        started = time.perf_counter()
+        total = len(repository.list())
+        list_ms = (time.perf_counter() - started) * 1000
+        print(f"{name:8s} creates: {rate:8.0f}/s   list of {total} docs: {list_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
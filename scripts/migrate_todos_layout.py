@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import argparse
+
+from app.core.config import settings
+from app.core.firestore import get_firestore_client
+from app.repositories.todos.firestore_repository import _COLLECTION
+from app.repositories.todos.sharded_repository import shard_for, shard_path
+
+# Firestore allows at most 500 writes per batch; a move is up to 2 writes per document
+MAX_BATCH_WRITES = 500
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy todos between the flat and sharded storage layouts")
+    parser.add_argument("--to", choices=["sharded", "flat"], default="sharded")
+    parser.add_argument("--shards", type=int, default=settings.todo_shard_count)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--delete-source", action="store_true", help="Delete source documents after copying")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    writes_per_doc = 2 if args.delete_source else 1
+    batch_size = max(1, min(args.batch_size, MAX_BATCH_WRITES // writes_per_doc))
+
+    db = get_firestore_client()
+    if args.to == "sharded":
+        sources = [db.collection(_COLLECTION)]
+
+        def target(doc_id: str):
+            return db.collection(shard_path(shard_for(doc_id, args.shards))).document(doc_id)
+    else:
+        sources = [db.collection(shard_path(shard)) for shard in range(args.shards)]
+
+        def target(doc_id: str):
+            return db.collection(_COLLECTION).document(doc_id)
+
+    # Same document ids on both sides, so the copy is idempotent and can be re-run after a failure
+    moved = 0
+    batch = db.batch()
+    pending = 0
+    for source in sources:
+        for doc in source.stream():
+            moved += 1
+            if args.dry_run:
+                continue
+            batch.set(target(doc.id), doc.to_dict() or {})
+            if args.delete_source:
+                batch.delete(doc.reference)
+            pending += 1
+            if pending >= batch_size:
+                batch.commit()
+                batch = db.batch()
+                pending = 0
+    if pending:
+        batch.commit()
+    print(("Would move" if args.dry_run else "Moved"), moved, "todos to the", args.to, "layout")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from uuid import uuid4
+
+from app.domain.exports.entities import ExportJob
+from app.domain.exports.interfaces import ExportJobRepository
+from app.domain.todos.entities import ArchiveBatch, TodoEntity
+from app.domain.todos.interfaces import TodoRepository
+
+
+def _project(data: Dict[str, Any], field_paths: Optional[Sequence[str]]) -> Dict[str, Any]:
+    if field_paths is None:
+        return data
+    return {k: v for k, v in data.items() if k in field_paths}
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeDocumentSnapshot:
+    def __init__(self, doc_id: str, data: Dict[str, Any], reference: Optional["FakeDocumentRef"] = None):
+        self.id = doc_id
+        self._data = data
+        self.exists = True
+        self.reference = reference
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._data)
+
+
+class FakeDocumentRef:
+    def __init__(self, collection: "FakeCollection", doc_id: str):
+        self._collection = collection
+        self.id = doc_id
+
+    def get(self, field_paths: Optional[Sequence[str]] = None) -> FakeDocumentSnapshot:
+        data = self._collection._store.get(self.id)
+        if data is None:
+            snap = FakeDocumentSnapshot(self.id, {}, reference=self)
+            snap.exists = False
+            return snap
+        return FakeDocumentSnapshot(self.id, _project(data, field_paths), reference=self)
+
+    def set(self, data: Dict[str, Any]) -> None:
+        self._collection._store[self.id] = dict(data)
+
+    def update(self, data: Dict[str, Any]) -> None:
+        current = self._collection._store.get(self.id, {})
+        current.update(data)
+        self._collection._store[self.id] = current
+
+    def delete(self) -> None:
+        self._collection._store.pop(self.id, None)
+
+
+class FakeQuery:
+    def __init__(self, collection: "FakeCollection"):
+        self._collection = collection
+        self.field_paths: Optional[List[str]] = None
+        self.filters: List[Any] = []
+        self._order_by = "created_at"
+        self._limit: Optional[int] = None
+        self._after: Optional[FakeDocumentSnapshot] = None
+
+    def select(self, field_paths: Sequence[str]) -> "FakeQuery":
+        self.field_paths = list(field_paths)
+        return self
+
+    def where(self, filter: Any) -> "FakeQuery":
+        # Accepts google.cloud.firestore_v1.base_query.FieldFilter ("==" and "<" only)
+        query = self._copy()
+        query.filters.append(filter)
+        return query
+
+    def order_by(self, field_path: str, **kwargs: Any) -> "FakeQuery":
+        query = self._copy()
+        query._order_by = field_path
+        return query
+
+    def limit(self, count: int) -> "FakeQuery":
+        query = self._copy()
+        query._limit = count
+        return query
+
+    def start_after(self, snapshot: "FakeDocumentSnapshot") -> "FakeQuery":
+        query = self._copy()
+        query._after = snapshot
+        return query
+
+    def _copy(self) -> "FakeQuery":
+        query = FakeQuery(self._collection)
+        query.field_paths = self.field_paths
+        query.filters = list(self.filters)
+        query._order_by = self._order_by
+        query._limit = self._limit
+        query._after = self._after
+        return query
+
+    def _matches(self, data: Dict[str, Any]) -> bool:
+        for f in self.filters:
+            value = data.get(f.field_path)
+            if f.op_string == "==" and value != f.value:
+                return False
+            if f.op_string == "<" and (value is None or not value < f.value):
+                return False
+        return True
+
+    def _sort_key(self, doc_id: str, data: Dict[str, Any]):
+        value = data.get(self._order_by)
+        return (_EPOCH if value is None else value, doc_id)
+
+    def stream(self) -> List[FakeDocumentSnapshot]:
+        items = sorted(
+            ((doc_id, data) for doc_id, data in self._collection._store.items() if self._matches(data)),
+            key=lambda item: self._sort_key(*item),
+        )
+        if self._after is not None:
+            # Like Firestore cursors: position by the order_by value, so deleted documents work too
+            cursor = self._sort_key(self._after.id, self._after._data)
+            items = [item for item in items if self._sort_key(*item) > cursor]
+        if self._limit is not None:
+            items = items[: self._limit]
+        self._collection.last_query = self
+        return [
+            FakeDocumentSnapshot(doc_id, _project(data, self.field_paths), reference=self._collection.document(doc_id))
+            for doc_id, data in items
+        ]
+
+
+class FakeCollection:
+    def __init__(self):
+        self._store: Dict[str, Dict[str, Any]] = {}
+        self.last_query: Optional[FakeQuery] = None
+
+    def document(self, doc_id: Optional[str] = None) -> FakeDocumentRef:
+        if doc_id is None:
+            doc_id = uuid4().hex
+        return FakeDocumentRef(self, doc_id)
+
+    def order_by(self, field_path: str, **kwargs: Any) -> FakeQuery:
+        return FakeQuery(self).order_by(field_path)
+
+    def where(self, filter: Any) -> FakeQuery:
+        return FakeQuery(self).where(filter)
+
+
+class FakeTransaction:
+    """Enough of `firestore.Transaction` for `@firestore.transactional`: writes apply on commit."""
+
+    def __init__(self) -> None:
+        self._id: Optional[bytes] = None
+        self._read_only = False
+        self._max_attempts = 1
+        self._writes: List[Callable[[], None]] = []
+        self.committed = False
+
+    def _clean_up(self) -> None:
+        self._writes = []
+        self._id = None
+
+    def _begin(self, retry_id: Optional[bytes] = None) -> None:
+        self._id = b"fake-transaction"
+
+    def _commit(self) -> list:
+        for write in self._writes:
+            write()
+        self.committed = True
+        self._clean_up()
+        return []
+
+    def _rollback(self) -> None:
+        self._clean_up()
+
+    def set(self, ref: FakeDocumentRef, data: Dict[str, Any]) -> None:
+        self._writes.append(lambda: ref.set(data))
+
+    def delete(self, ref: FakeDocumentRef) -> None:
+        self._writes.append(ref.delete)
+
+
+class FakeFirestoreClient:
+    # Collections are keyed by full path, e.g. "todos" or "todo_shards/003/todos"
+    def __init__(self) -> None:
+        self.collections: Dict[str, FakeCollection] = {}
+
+    def collection(self, path: str) -> FakeCollection:
+        return self.collections.setdefault(path, FakeCollection())
+
+    def transaction(self) -> FakeTransaction:
+        return FakeTransaction()
+
+    def get_all(self, refs: Sequence[FakeDocumentRef], transaction: Optional[FakeTransaction] = None):
+        return [ref.get() for ref in refs]
+
+
+class InMemoryTodoRepository(TodoRepository):
+    def __init__(self) -> None:
+        self._store: Dict[str, Dict[str, Any]] = {}
+        self._archive: Dict[str, Dict[str, Any]] = {}
+
+    def list(self, fields: Sequence[str] | None = None, include_archived: bool = False) -> List[TodoEntity]:
+        items = list(self._store.items())
+        if include_archived:
+            items += list(self._archive.items())
+        docs = [
+            TodoEntity(
+                id=doc_id,
+                title=data["title"],
+                description=data.get("description"),
+                completed=bool(data.get("completed", False)),
+                created_at=data["created_at"],
+                updated_at=data["updated_at"],
+            )
+            for doc_id, data in items
+        ]
+        docs.sort(key=lambda e: e.created_at)
+        return docs
+
+    def get(
+        self, todo_id: str, fields: Sequence[str] | None = None, include_archived: bool = False
+    ) -> TodoEntity | None:
+        data = self._store.get(todo_id)
+        if data is None and include_archived:
+            data = self._archive.get(todo_id)
+        if data is None:
+            return None
+        return TodoEntity(
+            id=todo_id,
+            title=data["title"],
+            description=data.get("description"),
+            completed=bool(data.get("completed", False)),
+            created_at=data["created_at"],
+            updated_at=data["updated_at"],
+        )
+
+    def iter_pages(
+        self, page_size: int = 500, fields: Sequence[str] | None = None, include_archived: bool = False
+    ) -> Iterator[List[TodoEntity]]:
+        docs = self.list(fields=fields, include_archived=include_archived)
+        for start in range(0, len(docs), page_size):
+            yield docs[start : start + page_size]
+
+    def create(self, title: str, description: str | None, completed: bool, now) -> TodoEntity:
+        doc_id = uuid4().hex
+        data = {
+            "title": title,
+            "description": description,
+            "completed": completed,
+            "created_at": now,
+            "updated_at": now,
+        }
+        self._store[doc_id] = data
+        return self.get(doc_id)  # type: ignore[return-value]
+
+    def update(self, todo_id: str, updates: dict, now) -> TodoEntity | None:
+        if todo_id not in self._store:
+            return None
+        current = self._store[todo_id]
+        current.update(updates)
+        current["updated_at"] = now
+        self._store[todo_id] = current
+        return self.get(todo_id)
+
+    def delete(self, todo_id: str) -> bool:
+        return self._store.pop(todo_id, None) is not None
+
+    def archive_batch(self, cutoff, now, batch_size: int = 200, cursor=None) -> ArchiveBatch:
+        expired = [
+            doc_id for doc_id, data in self._store.items() if data.get("completed") and data["updated_at"] < cutoff
+        ][:batch_size]
+        for doc_id in expired:
+            self._archive[doc_id] = {**self._store.pop(doc_id), "archived_at": now}
+        # Moved todos leave the store, so the next batch just scans again from the start
+        return ArchiveBatch(moved=len(expired), cursor=True if len(expired) == batch_size else None)
+
+
+class FaultInjectingTodoRepository(TodoRepository):
+    """Wrap a repository and raise scripted errors or add latency per operation.
+
+    `faults` maps an operation name to a sequence of exceptions (or None for a
+    successful call) consumed one per call; once exhausted, calls succeed.
+    """
+
+    def __init__(
+        self,
+        inner: TodoRepository,
+        faults: Dict[str, Sequence[BaseException | None]] | None = None,
+        latency: float = 0.0,
+        sleep: Callable[[float], None] | None = None,
+    ) -> None:
+        self._inner = inner
+        self._faults = {op: list(errors) for op, errors in (faults or {}).items()}
+        self._latency = latency
+        self._sleep = sleep
+        self.calls: Dict[str, int] = {}
+
+    def fail(self, operation: str, *errors: BaseException | None) -> None:
+        self._faults.setdefault(operation, []).extend(errors)
+
+    def _maybe_fail(self, operation: str) -> None:
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        if self._latency and self._sleep is not None:
+            self._sleep(self._latency)
+        pending = self._faults.get(operation)
+        if pending:
+            error = pending.pop(0)
+            if error is not None:
+                raise error
+
+    def list(self, fields: Sequence[str] | None = None, include_archived: bool = False) -> List[TodoEntity]:
+        self._maybe_fail("list")
+        return self._inner.list(fields=fields, include_archived=include_archived)
+
+    def get(
+        self, todo_id: str, fields: Sequence[str] | None = None, include_archived: bool = False
+    ) -> TodoEntity | None:
+        self._maybe_fail("get")
+        return self._inner.get(todo_id, fields=fields, include_archived=include_archived)
+
+    def iter_pages(
+        self, page_size: int = 500, fields: Sequence[str] | None = None, include_archived: bool = False
+    ) -> Iterator[List[TodoEntity]]:
+        self._maybe_fail("iter_pages")
+        return self._inner.iter_pages(page_size=page_size, fields=fields, include_archived=include_archived)
+
+    def create(self, title: str, description: str | None, completed: bool, now) -> TodoEntity:
+        self._maybe_fail("create")
+        return self._inner.create(title=title, description=description, completed=completed, now=now)
+
+    def update(self, todo_id: str, updates: dict, now) -> TodoEntity | None:
+        self._maybe_fail("update")
+        return self._inner.update(todo_id=todo_id, updates=updates, now=now)
+
+    def delete(self, todo_id: str) -> bool:
+        self._maybe_fail("delete")
+        return self._inner.delete(todo_id)
+
+    def archive_batch(self, cutoff, now, batch_size: int = 200, cursor=None) -> ArchiveBatch:
+        self._maybe_fail("archive")
+        return self._inner.archive_batch(cutoff=cutoff, now=now, batch_size=batch_size, cursor=cursor)
+
+
+class InMemoryExportJobRepository(ExportJobRepository):
+    def __init__(self) -> None:
+        self._jobs: Dict[str, ExportJob] = {}
+
+    def create(self, job: ExportJob) -> ExportJob:
+        self._jobs[job.id] = replace(job)
+        return job
+
+    def get(self, job_id: str) -> ExportJob | None:
+        job = self._jobs.get(job_id)
+        return replace(job) if job is not None else None
+
+    def update(self, job_id: str, changes: Dict[str, Any]) -> None:
+        self._jobs[job_id] = replace(self._jobs[job_id], **changes)
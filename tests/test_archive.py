@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app import cli
+from app.api.routers import todos as todos_router
+from app.core.resilience import CircuitBreaker, ResiliencePolicy, RetryPolicy
+from app.main import app
+from app.repositories.todos.firestore_repository import ARCHIVE_COLLECTION, FirestoreTodoRepository
+from app.repositories.todos.resilient_repository import ResilientTodoRepository
+from app.repositories.todos.sharded_repository import ShardedFirestoreTodoRepository
+from app.services.todos.service import TodoService
+from tests.fakes import FakeFirestoreClient, FaultInjectingTodoRepository, InMemoryTodoRepository
+
+
+
+def _seed(repo: InMemoryTodoRepository):
+    old = datetime.now(timezone.utc) - timedelta(days=60)
+    done_old = repo.create(title="done old", description=None, completed=True, now=old)
+    open_old = repo.create(title="open old", description=None, completed=False, now=old)
+    done_new = repo.create(title="done new", description=None, completed=True, now=datetime.now(timezone.utc))
+    return done_old, open_old, done_new
+
+
+def test_archive_moves_only_old_completed_todos():
+    repo = InMemoryTodoRepository()
+    done_old, open_old, done_new = _seed(repo)
+    service = TodoService(repository=repo)
+
+    assert service.archive_completed_todos(older_than=timedelta(days=30)) == 1
+    assert [e.id for e in service.list_todos()] == [open_old.id, done_new.id]
+    assert service.get_todo(done_old.id) is None
+    assert service.get_todo(done_old.id, include_archived=True).title == "done old"
+    assert len(service.list_todos(include_archived=True)) == 3
+
+
+def test_include_archived_query_parameter():
+    repo = InMemoryTodoRepository()
+    done_old, _, _ = _seed(repo)
+    TodoService(repository=repo).archive_completed_todos(older_than=timedelta(days=30))
+    app.dependency_overrides[todos_router.get_todo_service] = lambda: TodoService(repository=repo)
+    try:
+        client = TestClient(app)
+        assert len(client.get("/todos/").json()) == 2
+        assert len(client.get("/todos/", params={"include_archived": "true"}).json()) == 3
+        assert client.get(f"/todos/{done_old.id}").status_code == 404
+        assert client.get(f"/todos/{done_old.id}", params={"include_archived": "true"}).status_code == 200
+        page = client.get("/todos/paged", params={"include_archived": "true", "completed": "true"}).json()
+        assert {i["title"] for i in page["items"]} == {"done old", "done new"}
+    finally:
+        app.dependency_overrides.pop(todos_router.get_todo_service, None)
+
+
+def test_archive_command(monkeypatch, capsys):
+    repo = InMemoryTodoRepository()
+    _seed(repo)
+    monkeypatch.setattr(todos_router, "get_todo_service", lambda: TodoService(repository=repo))
+
+    assert cli.main(["archive", "--older-than-days", "30"]) == 0
+    assert "Archived 1 todos" in capsys.readouterr().out
+
+
+class ReopeningClient(FakeFirestoreClient):
+    """Reopen some todos between the candidate query and the transactional re-read."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.reopen: set = set()
+
+    def get_all(self, refs, transaction=None):
+        for ref in refs:
+            if ref.id in self.reopen:
+                ref.update({"completed": False})
+        return super().get_all(refs, transaction=transaction)
+
+
+def _seed_firestore(repo: FirestoreTodoRepository, done_old: int, open_old: int = 0):
+    now = datetime.now(timezone.utc)
+    done = [
+        repo.create(title=f"done {i}", description=None, completed=True, now=now - timedelta(days=60, minutes=i))
+        for i in range(done_old)
+    ]
+    for i in range(open_old):
+        repo.create(title=f"open {i}", description=None, completed=False, now=now - timedelta(days=60))
+    repo.create(title="done new", description=None, completed=True, now=now)
+    return done
+
+
+def _archive(repo, batch_size: int = 200) -> int:
+    return TodoService(repository=repo).archive_completed_todos(older_than=timedelta(days=30), batch_size=batch_size)
+
+
+def test_firestore_archive_moves_old_completed_todos_in_a_transaction():
+    client = FakeFirestoreClient()
+    repo = FirestoreTodoRepository(client=client, archive_ttl=timedelta(days=90))
+    done = _seed_firestore(repo, done_old=2, open_old=1)
+
+    started = datetime.now(timezone.utc)
+    assert _archive(repo) == 2
+    archived = client.collection(ARCHIVE_COLLECTION)._store
+    assert set(archived) == {e.id for e in done}
+    for data in archived.values():
+        assert data["archived_at"] >= started
+        assert data["expire_at"] == data["archived_at"] + timedelta(days=90)
+    query = client.collection("todos").last_query
+    assert [(f.field_path, f.op_string) for f in query.filters] == [("completed", "=="), ("updated_at", "<")]
+    assert query.filters[1].value == data["archived_at"] - timedelta(days=30)
+    assert query._order_by == "updated_at"
+    assert {e.title for e in repo.list()} == {"open 0", "done new"}
+
+
+def test_firestore_archive_without_ttl_sets_no_expire_at():
+    client = FakeFirestoreClient()
+    repo = FirestoreTodoRepository(client=client)
+    _seed_firestore(repo, done_old=1)
+
+    assert _archive(repo) == 1
+    [data] = client.collection(ARCHIVE_COLLECTION)._store.values()
+    assert "expire_at" not in data
+
+
+def test_firestore_archive_keeps_going_past_batches_skipped_by_the_recheck():
+    client = ReopeningClient()
+    repo = FirestoreTodoRepository(client=client)
+    done = _seed_firestore(repo, done_old=5)
+    # The oldest batch is reopened concurrently: it moves nothing, but later candidates remain
+    oldest = sorted(done, key=lambda e: e.updated_at)[:2]
+    client.reopen = {e.id for e in oldest}
+
+    assert _archive(repo, batch_size=2) == 3
+    assert set(client.collection(ARCHIVE_COLLECTION)._store) == {e.id for e in done} - client.reopen
+    assert {e.id for e in repo.list() if not e.completed} == client.reopen
+
+
+def test_sharded_archive_fans_out_to_every_shard():
+    client = FakeFirestoreClient()
+    repo = ShardedFirestoreTodoRepository(client=client, shard_count=4)
+    done = _seed_firestore(repo, done_old=12)
+
+    assert _archive(repo, batch_size=2) == 12
+    assert set(client.collection(ARCHIVE_COLLECTION)._store) == {e.id for e in done}
+    assert [e.title for e in repo.list()] == ["done new"]
+    assert len(repo.list(include_archived=True)) == 13
+
+
+def test_transient_error_retries_only_the_failed_batch():
+    client = FakeFirestoreClient()
+    firestore_repo = FirestoreTodoRepository(client=client)
+    _seed_firestore(firestore_repo, done_old=5)
+    faulty = FaultInjectingTodoRepository(firestore_repo, faults={"archive": [None, TimeoutError()]})
+    policy = ResiliencePolicy(
+        breaker=CircuitBreaker(failure_threshold=5, reset_timeout=10.0),
+        retry=RetryPolicy(max_retries=2, base_delay=0.0, max_delay=0.0),
+        sleep=lambda seconds: None,
+    )
+
+    assert _archive(ResilientTodoRepository(faulty, policy), batch_size=2) == 5
+    # 3 batches plus one retry of the second
+    assert faulty.calls["archive"] == 4
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import dataclasses
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.domain.todos.entities import TodoEntity
+from app.repositories.todos.decoding import decode_snapshot, decode_snapshots, snapshot_data
+from app.repositories.todos.firestore_repository import FirestoreTodoRepository
+from tests.fakes import FakeDocumentSnapshot, FakeFirestoreClient
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class _NoCopySnapshot(FakeDocumentSnapshot):
+    def to_dict(self):
+        raise AssertionError("decoding must not copy snapshot data")
+
+
+def _snap(doc_id: str, **data) -> _NoCopySnapshot:
+    data = {"title": doc_id, "completed": False, "created_at": NOW, "updated_at": NOW, **data}
+    return _NoCopySnapshot(doc_id, data)
+
+
+def test_entity_is_slotted_and_immutable():
+    entity = decode_snapshot(_snap("a"))
+    assert not hasattr(entity, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        entity.title = "changed"
+
+
+def test_decode_snapshots_reads_snapshot_fields_without_copying():
+    entities = decode_snapshots([_snap("a", description="x"), _snap("b", completed=True)])
+    assert entities == [
+        TodoEntity(id="a", title="a", description="x", completed=False, created_at=NOW, updated_at=NOW),
+        TodoEntity(id="b", title="b", description=None, completed=True, created_at=NOW, updated_at=NOW),
+    ]
+
+
+def test_decode_snapshot_falls_back_to_to_dict():
+    class SnapshotWithoutData:
+        id = "a"
+
+        def to_dict(self):
+            return {"title": "from to_dict", "completed": True, "created_at": NOW, "updated_at": NOW}
+
+    assert decode_snapshot(SnapshotWithoutData()) == TodoEntity(
+        id="a", title="from to_dict", description=None, completed=True, created_at=NOW, updated_at=NOW
+    )
+
+
+def test_snapshot_data_matches_to_dict_for_sdk_snapshots():
+    # Guards the private `_data` read against SDK changes within the pinned version range
+    document = pytest.importorskip("google.cloud.firestore_v1.document")
+    base_document = pytest.importorskip("google.cloud.firestore_v1.base_document")
+    ref = document.DocumentReference("todos", "a", client=None)
+    data = {"title": "t", "description": None, "completed": True, "created_at": NOW, "updated_at": NOW}
+
+    snap = base_document.DocumentSnapshot(ref, data, True, NOW, NOW, NOW)
+    assert snapshot_data(snap) == snap.to_dict() == data
+
+    # Missing documents have no data at all: both paths decode to an empty mapping
+    missing = base_document.DocumentSnapshot(ref, None, False, NOW, None, None)
+    assert dict(snapshot_data(missing)) == {}
+    assert decode_snapshot(missing).title == ""
+
+
+def test_update_returns_post_image_without_mutating_input():
+    repo = FirestoreTodoRepository(client=FakeFirestoreClient())
+    created = repo.create(title="t", description=None, completed=False, now=NOW)
+    updates = {"completed": True}
+    later = NOW + timedelta(minutes=1)
+
+    updated = repo.update(created.id, updates, now=later)
+
+    assert updates == {"completed": True}
+    assert updated == dataclasses.replace(created, completed=True, updated_at=later)
+    assert repo.get(created.id) == updated
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routers import exports as exports_router
+from app.main import app
+from app.repositories.todos.firestore_repository import FirestoreTodoRepository
+from app.repositories.todos.sharded_repository import ShardedFirestoreTodoRepository
+from app.services.exports.service import ExportService
+from tests.fakes import FakeFirestoreClient, InMemoryExportJobRepository, InMemoryTodoRepository
+
+
+def _service(
+    tmp_path, count: int = 7, todos: InMemoryTodoRepository | None = None, export_dir=None, bucket=None
+) -> ExportService:
+    todos = todos or InMemoryTodoRepository()
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        todos.create(title=f"t{i}", description=None, completed=i % 2 == 0, now=start + timedelta(minutes=i))
+    return ExportService(
+        jobs=InMemoryExportJobRepository(),
+        todos=lambda: todos,
+        executor=ThreadPoolExecutor(max_workers=1),
+        export_dir=str(export_dir or tmp_path),
+        page_size=3,
+        bucket=bucket,
+    )
+
+
+def _wait(service: ExportService, job_id: str):
+    for _ in range(100):
+        job = service.get_job(job_id)
+        if job.status in {"succeeded", "failed"}:
+            return job
+        time.sleep(0.02)
+    raise AssertionError("export did not finish")
+
+
+def test_jsonl_export_streams_every_page(tmp_path):
+    service = _service(tmp_path)
+    job = _wait(service, service.start_export("jsonl", fields=("id", "title")).id)
+
+    assert job.status == "succeeded"
+    assert job.rows_written == 7
+    with gzip.open(job.location, "rt") as fh:
+        rows = [json.loads(line) for line in fh]
+    assert [r["title"] for r in rows] == [f"t{i}" for i in range(7)]
+    assert set(rows[0]) == {"id", "title"}
+
+
+def test_csv_export_has_header_and_rows(tmp_path):
+    service = _service(tmp_path)
+    job = _wait(service, service.start_export("csv").id)
+
+    with gzip.open(job.location, "rt", newline="") as fh:
+        rows = list(csv.reader(fh))
+    assert rows[0] == ["id", "title", "description", "completed", "created_at", "updated_at"]
+    assert len(rows) == 8
+
+
+def test_parquet_export(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    service = _service(tmp_path)
+    job = _wait(service, service.start_export("parquet").id)
+
+    table = pq.read_table(job.location)
+    assert table.num_rows == 7
+    assert table.column("completed").to_pylist()[:2] == [True, False]
+
+
+def test_export_api_flow(tmp_path):
+    service = _service(tmp_path)
+    app.dependency_overrides[exports_router.get_export_service] = lambda: service
+    try:
+        client = TestClient(app)
+        resp = client.post("/exports", json={"format": "jsonl"})
+        assert resp.status_code == 202
+        job_id = resp.json()["id"]
+
+        _wait(service, job_id)
+        body = client.get(f"/exports/{job_id}").json()
+        assert body["status"] == "succeeded"
+        assert body["rows_written"] == 7
+        assert body["download_url"].endswith(f"/exports/{job_id}/download")
+
+        download = client.get(f"/exports/{job_id}/download")
+        assert download.status_code == 200
+        assert len(gzip.decompress(download.content).splitlines()) == 7
+
+        assert client.post("/exports", json={"format": "xml"}).status_code == 422
+        assert client.post("/exports", json={"fields": ["secret"]}).status_code == 422
+        assert client.get("/exports/missing").status_code == 404
+    finally:
+        app.dependency_overrides.pop(exports_router.get_export_service, None)
+
+
+def test_bucket_export_uploads_and_removes_local_file(tmp_path, monkeypatch):
+    uploads = {}
+
+    class FakeBlob:
+        def __init__(self, bucket: str, name: str) -> None:
+            self.key = f"{bucket}/{name}"
+
+        def upload_from_filename(self, path: str) -> None:
+            with open(path, "rb") as fh:
+                uploads[self.key] = fh.read()
+
+    class FakeClient:
+        def bucket(self, name: str):
+            return types.SimpleNamespace(blob=lambda blob_name: FakeBlob(name, blob_name))
+
+    monkeypatch.setitem(sys.modules, "google.cloud.storage", types.SimpleNamespace(Client=FakeClient))
+    service = _service(tmp_path, bucket="exports-bucket")
+    job = _wait(service, service.start_export("jsonl").id)
+
+    assert job.status == "succeeded", job.error
+    assert job.location == f"gs://exports-bucket/exports/{job.id}.jsonl.gz"
+    [content] = uploads.values()
+    assert job.bytes_written == len(content)
+    assert len(gzip.decompress(content).splitlines()) == 7
+    assert list(tmp_path.iterdir()) == []
+
+
+class FailingAfterFirstPage(InMemoryTodoRepository):
+    def iter_pages(self, page_size=500, fields=None, include_archived=False):
+        pages = super().iter_pages(page_size=page_size, fields=fields, include_archived=include_archived)
+        yield next(pages)
+        raise TimeoutError("deadline exceeded")
+
+
+def test_failed_export_removes_partial_file(tmp_path):
+    service = _service(tmp_path, todos=FailingAfterFirstPage())
+    job = _wait(service, service.start_export("jsonl").id)
+
+    assert job.status == "failed"
+    assert job.error == "deadline exceeded"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unusable_export_dir_marks_job_failed(tmp_path):
+    # A regular file where the export directory should be: makedirs fails
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    service = _service(tmp_path, export_dir=blocker / "exports")
+    job = _wait(service, service.start_export("jsonl").id)
+
+    assert job.status == "failed"
+    assert job.finished_at is not None
+
+
+@pytest.mark.parametrize("sharded", [False, True], ids=["flat", "sharded"])
+def test_firestore_iter_pages_crosses_page_boundaries(sharded):
+    client = FakeFirestoreClient()
+    if sharded:
+        repo = ShardedFirestoreTodoRepository(client=client, shard_count=4)
+    else:
+        repo = FirestoreTodoRepository(client=client)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    created = [
+        repo.create(title=f"t{i}", description=None, completed=False, now=start + timedelta(minutes=i))
+        for i in range(11)
+    ]
+
+    pages = list(repo.iter_pages(page_size=3))
+    assert [len(page) for page in pages] == [3, 3, 3, 2]
+    assert [e.id for page in pages for e in page] == [e.id for e in created]
+
+    projected = list(repo.iter_pages(page_size=4, fields=("id", "title")))
+    assert [e.title for page in projected for e in page] == [f"t{i}" for i in range(11)]
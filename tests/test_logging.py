@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import queue
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.logging import BoundedQueueHandler, JsonFormatter, setup_logging, shutdown_logging
+from app.core.metrics import metrics
+from app.core.request_context import request_id_var
+from app.middlewares.access_log import AccessLogMiddleware
+from app.middlewares.request_id import RequestIdMiddleware
+from app.repositories.todos.sharded_repository import ShardedFirestoreTodoRepository
+from tests.fakes import FakeFirestoreClient
+
+
+@pytest.fixture
+def log_lines():
+    root = logging.getLogger()
+    level = root.level
+    stream = io.StringIO()
+    listener = setup_logging("INFO", stream=stream)
+    stopped = []
+
+    def read():
+        # Stopping the listener writes out everything still queued
+        shutdown_logging(listener)
+        stopped.append(True)
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        return [line for line in lines if line["logger"] == "app.access"]
+
+    yield read
+    if not stopped:
+        shutdown_logging(listener)
+    root.setLevel(level)
+
+
+def _app(**options) -> FastAPI:
+    app = FastAPI()
+    # Sharded listings fan out to a thread pool: one Firestore call per shard
+    repo = ShardedFirestoreTodoRepository(client=FakeFirestoreClient(), shard_count=4)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: str):
+        return {"count": len(repo.list())}
+
+    @app.get("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(AccessLogMiddleware, **options)
+    app.add_middleware(RequestIdMiddleware)
+    return app
+
+
+def test_access_log_line_has_request_context(log_lines):
+    client = TestClient(_app())
+    response = client.get("/items/42", headers={"X-Request-ID": "req-1"})
+    assert response.status_code == 200
+
+    [line] = log_lines()
+    assert line["request_id"] == "req-1"
+    assert line["route"] == "/items/{item_id}"
+    assert line["path"] == "/items/42"
+    assert line["method"] == "GET"
+    assert line["status"] == 200
+    assert line["firestore_ops"] == 4
+    assert line["latency_ms"] >= 0
+    assert line["level"] == "INFO"
+
+
+def test_sampling_skips_successes_but_keeps_errors_and_slow_requests(log_lines):
+    metrics.reset()
+    client = TestClient(
+        _app(route_sample_rates={"GET /items/{item_id}": 0.0, "/boom": 0.0}), raise_server_exceptions=False
+    )
+    client.get("/items/1")
+    client.get("/boom")
+    slow_client = TestClient(_app(route_sample_rates={"GET /items/{item_id}": 0.0}, slow_ms=0))
+    slow_client.get("/items/2")
+
+    lines = log_lines()
+    assert [(line["path"], line["status"]) for line in lines] == [("/boom", 500), ("/items/2", 200)]
+    assert lines[0]["level"] == "ERROR"
+    assert metrics.get("access_log.sampled_out") == 1
+
+
+def test_queue_handler_drops_instead_of_blocking():
+    metrics.reset()
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1))
+    logger = logging.getLogger("tests.bounded")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(3):
+            logger.warning("message %d", i)
+    finally:
+        logger.removeHandler(handler)
+    assert handler.queue.qsize() == 1
+    assert metrics.get("logging.dropped") == 2
+
+
+def test_prepare_defers_formatting_and_captures_request_id():
+    handler = BoundedQueueHandler(queue.Queue())
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "todo %s", ("abc",), None)
+    token = request_id_var.set("req-2")
+    try:
+        prepared = handler.prepare(record)
+    finally:
+        request_id_var.reset(token)
+    assert prepared.msg == "todo %s" and prepared.args == ("abc",)
+
+    line = json.loads(JsonFormatter().format(prepared))
+    assert line["message"] == "todo abc"
+    assert line["request_id"] == "req-2"
+
+
+def test_json_formatter_drops_uvicorn_color_message():
+    record = logging.LogRecord("uvicorn.error", logging.INFO, __file__, 1, "Started server process", (), None)
+    record.color_message = "Started server process [\x1b[36m%d\x1b[0m]"
+    line = json.loads(JsonFormatter().format(record))
+    assert "color_message" not in line
+    assert line["message"] == "Started server process"
+
+
+def test_queue_depth_gauge_follows_the_current_queue():
+    root = logging.getLogger()
+    level = root.level
+    first = setup_logging("INFO", stream=io.StringIO())
+    shutdown_logging(first)
+    assert "logging.queue_depth" not in metrics.snapshot()
+
+    first = setup_logging("INFO", stream=io.StringIO())
+    second = setup_logging("INFO", stream=io.StringIO())
+    try:
+        # Shutting down the older listener must not drop the gauge of the current one
+        shutdown_logging(first)
+        logging.getLogger("tests.gauge").warning("queued")
+        assert metrics.snapshot()["logging.queue_depth"] == second.queue.qsize()
+    finally:
+        shutdown_logging(second)
+        root.setLevel(level)
+    assert "logging.queue_depth" not in metrics.snapshot()
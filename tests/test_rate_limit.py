@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.rate_limit import InMemoryRateLimitBackend, RateLimitRule
+from app.middlewares.load_shedding import LoadSheddingMiddleware
+from app.middlewares.rate_limit import RateLimitMiddleware
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_app(backend, routes=None, api_keys=(), **options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/todos/")
+    def list_todos():
+        return []
+
+    @app.get("/todos/{todo_id}")
+    def get_todo(todo_id: str):
+        return {"id": todo_id}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=backend,
+        default_rule=RateLimitRule(rate=100, burst=100),
+        routes=routes or {},
+        api_keys=api_keys,
+        **options,
+    )
+    return app
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    backend = InMemoryRateLimitBackend(clock=clock)
+    rule = RateLimitRule(rate=1, burst=2)
+
+    results = [asyncio.run(backend.acquire("k", rule)).allowed for _ in range(3)]
+    assert results == [True, True, False]
+
+    denied = asyncio.run(backend.acquire("k", rule))
+    assert denied.retry_after == 1.0
+
+    clock.now = 1.0
+    assert asyncio.run(backend.acquire("k", rule)).allowed is True
+
+
+def test_route_rule_limits_per_client():
+    backend = InMemoryRateLimitBackend(clock=FakeClock())
+    app = _make_app(backend, routes={"GET /todos/": RateLimitRule(rate=1, burst=2)}, api_keys={"other"})
+    client = TestClient(app)
+
+    assert client.get("/todos/").status_code == 200
+    assert client.get("/todos/").status_code == 200
+    resp = client.get("/todos/")
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "1"
+
+    # Other routes use the default rule and another client has its own bucket
+    assert client.get("/todos/abc").status_code == 200
+    assert client.get("/todos/", headers={"X-API-Key": "other"}).status_code == 200
+
+
+def test_unknown_api_keys_share_the_client_ip_bucket():
+    backend = InMemoryRateLimitBackend(clock=FakeClock())
+    app = _make_app(backend, routes={"GET /todos/": RateLimitRule(rate=1, burst=2)}, api_keys={"known"})
+    client = TestClient(app)
+
+    statuses = [client.get("/todos/", headers={"X-API-Key": f"fake-{i}"}).status_code for i in range(5)]
+    assert statuses == [200, 200, 429, 429, 429]
+    assert client.get("/todos/", headers={"X-API-Key": "known"}).status_code == 200
+
+
+def test_spoofed_forwarded_for_entries_share_the_proxy_bucket():
+    backend = InMemoryRateLimitBackend(clock=FakeClock())
+    app = _make_app(backend, routes={"GET /todos/": RateLimitRule(rate=1, burst=2)}, trust_forwarded_for=True)
+    client = TestClient(app)
+
+    # The proxy appends the real client address after whatever the client sent
+    statuses = [
+        client.get("/todos/", headers={"X-Forwarded-For": f"10.0.0.{i}, 203.0.113.7"}).status_code for i in range(5)
+    ]
+    assert statuses == [200, 200, 429, 429, 429]
+    assert client.get("/todos/", headers={"X-Forwarded-For": "203.0.113.8"}).status_code == 200
+
+
+def test_trusted_proxy_hops_skips_our_own_proxies():
+    backend = InMemoryRateLimitBackend(clock=FakeClock())
+    app = _make_app(
+        backend,
+        routes={"GET /todos/": RateLimitRule(rate=1, burst=1)},
+        trust_forwarded_for=True,
+        trusted_proxy_hops=2,
+    )
+    client = TestClient(app)
+
+    assert client.get("/todos/", headers={"X-Forwarded-For": "spoof-1, 203.0.113.7, 10.1.0.1"}).status_code == 200
+    assert client.get("/todos/", headers={"X-Forwarded-For": "spoof-2, 203.0.113.7, 10.1.0.2"}).status_code == 429
+
+
+def test_full_table_evicts_least_recently_used_bucket_only():
+    backend = InMemoryRateLimitBackend(clock=FakeClock(), max_keys=3)
+    rule = RateLimitRule(rate=1, burst=1)
+
+    assert asyncio.run(backend.acquire("limited", rule)).allowed is True
+    for key in ("a", "b"):
+        asyncio.run(backend.acquire(key, rule))
+    # Touching the limited client makes "a" the oldest entry
+    assert asyncio.run(backend.acquire("limited", rule)).allowed is False
+    asyncio.run(backend.acquire("c", rule))
+
+    assert list(backend._buckets) == ["b", "limited", "c"]
+    assert asyncio.run(backend.acquire("limited", rule)).allowed is False
+
+
+def test_load_shedding_returns_503_over_threshold():
+    in_flight = {"value": 0}
+    app = FastAPI()
+
+    @app.get("/todos/")
+    def list_todos():
+        return []
+
+    app.add_middleware(LoadSheddingMiddleware, in_flight=lambda: in_flight["value"], max_in_flight=2)
+    client = TestClient(app)
+
+    assert client.get("/todos/").status_code == 200
+    in_flight["value"] = 2
+    resp = client.get("/todos/")
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routers import todos as todos_router
+from app.core.firestore import firestore_resilience
+from app.core.resilience import (
+    BackendUnavailableError,
+    CircuitBreaker,
+    ResiliencePolicy,
+    RetryPolicy,
+    attempt_timeout,
+)
+from app.main import app
+from app.repositories.todos.resilient_repository import ResilientTodoRepository
+from app.services.todos.service import TodoService
+from tests.fakes import FaultInjectingTodoRepository, InMemoryTodoRepository
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _policy(clock: FakeClock, **kwargs) -> ResiliencePolicy:
+    breaker = CircuitBreaker(failure_threshold=kwargs.pop("threshold", 3), reset_timeout=10.0, clock=clock)
+    return ResiliencePolicy(
+        breaker=breaker,
+        retry=RetryPolicy(max_retries=2, base_delay=0.1, max_delay=1.0),
+        clock=clock,
+        sleep=clock.sleep,
+        **kwargs,
+    )
+
+
+def _raising(exc: BaseException):
+    def fn():
+        raise exc
+
+    return fn
+
+
+def test_idempotent_reads_are_retried():
+    clock = FakeClock()
+    faulty = FaultInjectingTodoRepository(InMemoryTodoRepository(), faults={"list": [TimeoutError(), TimeoutError()]})
+    repo = ResilientTodoRepository(faulty, _policy(clock))
+
+    assert repo.list() == []
+    assert faulty.calls["list"] == 3
+
+
+def test_writes_are_not_retried():
+    clock = FakeClock()
+    faulty = FaultInjectingTodoRepository(InMemoryTodoRepository(), faults={"create": [TimeoutError()]})
+    repo = ResilientTodoRepository(faulty, _policy(clock))
+
+    with pytest.raises(BackendUnavailableError):
+        repo.create(title="t", description=None, completed=False, now=datetime.now(timezone.utc))
+    assert faulty.calls["create"] == 1
+
+
+def test_deadline_stops_retries():
+    clock = FakeClock()
+    faulty = FaultInjectingTodoRepository(
+        InMemoryTodoRepository(), faults={"get": [TimeoutError()] * 3}, latency=5.0, sleep=clock.sleep
+    )
+    repo = ResilientTodoRepository(faulty, _policy(clock, deadlines={"get": 4.0}))
+
+    with pytest.raises(BackendUnavailableError):
+        repo.get("missing")
+    assert faulty.calls["get"] == 1
+
+
+def test_circuit_opens_then_recovers_after_reset_timeout():
+    clock = FakeClock()
+    policy = _policy(clock, threshold=2)
+    faulty = FaultInjectingTodoRepository(InMemoryTodoRepository(), faults={"delete": [TimeoutError()] * 2})
+    repo = ResilientTodoRepository(faulty, policy)
+
+    for _ in range(2):
+        with pytest.raises(BackendUnavailableError):
+            repo.delete("x")
+    assert policy.breaker.state == CircuitBreaker.OPEN
+
+    # Fails fast without touching the backend
+    with pytest.raises(BackendUnavailableError):
+        repo.delete("x")
+    assert faulty.calls["delete"] == 2
+
+    clock.now += 10.0
+    assert policy.breaker.state == CircuitBreaker.HALF_OPEN
+    assert repo.delete("x") is False
+    assert policy.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_non_transient_errors_do_not_close_a_half_open_circuit():
+    clock = FakeClock()
+    policy = _policy(clock, threshold=1)
+    with pytest.raises(BackendUnavailableError):
+        policy.call("create", _raising(TimeoutError()))
+    clock.now += 10.0
+
+    with pytest.raises(ValueError):
+        policy.call("get", _raising(ValueError("bad request")))
+    # Still half-open, and the probe slot was released for the next call
+    assert policy.breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(KeyboardInterrupt):
+        policy.call("get", _raising(KeyboardInterrupt()))
+    assert policy.call("get", lambda: "ok") == "ok"
+    assert policy.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_each_attempt_gets_the_remaining_deadline_as_timeout():
+    clock = FakeClock()
+    policy = _policy(clock, deadlines={"get": 4.0})
+    timeouts = []
+
+    def flaky():
+        timeouts.append(attempt_timeout())
+        clock.now += 1.0
+        if len(timeouts) == 1:
+            raise TimeoutError()
+        return "ok"
+
+    assert policy.call("get", flaky) == "ok"
+    assert timeouts[0] == 4.0
+    assert 2.8 <= timeouts[1] <= 3.0
+    assert attempt_timeout() is None
+
+
+def test_page_scan_in_half_open_does_not_keep_the_circuit_open():
+    clock = FakeClock()
+    policy = _policy(clock, threshold=1)
+    inner = InMemoryTodoRepository()
+    for i in range(5):
+        inner.create(title=f"t{i}", description=None, completed=False, now=datetime.now(timezone.utc))
+    repo = ResilientTodoRepository(inner, policy)
+    with pytest.raises(BackendUnavailableError):
+        policy.call("get", _raising(TimeoutError()))
+    clock.now += 10.0
+    assert policy.breaker.state == CircuitBreaker.HALF_OPEN
+
+    assert [len(page) for page in repo.iter_pages(page_size=2)] == [2, 2, 1]
+    assert policy.breaker.state == CircuitBreaker.CLOSED
+    assert len(repo.list()) == 5
+
+
+def test_failed_page_is_recorded_and_not_retried():
+    clock = FakeClock()
+    policy = _policy(clock, threshold=1)
+
+    class FailingScan(InMemoryTodoRepository):
+        def iter_pages(self, page_size=500, fields=None, include_archived=False):
+            yield []
+            raise TimeoutError()
+
+    pages = ResilientTodoRepository(FailingScan(), policy).iter_pages()
+    assert next(pages) == []
+    with pytest.raises(BackendUnavailableError):
+        next(pages)
+    assert policy.breaker.state == CircuitBreaker.OPEN
+
+    # An abandoned scan does not hold the half-open probe either
+    clock.now += 10.0
+    abandoned = ResilientTodoRepository(FailingScan(), policy).iter_pages()
+    next(abandoned)
+    abandoned.close()
+    assert policy.call("get", lambda: "ok") == "ok"
+
+
+def test_open_circuit_maps_to_503_and_health(monkeypatch):
+    clock = FakeClock()
+    # Trip the shared policy that /health reports on
+    monkeypatch.setattr(
+        firestore_resilience, "breaker", CircuitBreaker(failure_threshold=1, reset_timeout=10.0, clock=clock)
+    )
+    faulty = FaultInjectingTodoRepository(InMemoryTodoRepository(), faults={"create": [TimeoutError()]})
+    service = TodoService(repository=ResilientTodoRepository(faulty, firestore_resilience))
+    app.dependency_overrides[todos_router.get_todo_service] = lambda: service
+    try:
+        client = TestClient(app)
+        resp = client.post("/todos/", json={"title": "x"})
+        assert resp.status_code == 503
+        assert "Retry-After" in resp.headers
+
+        resp = client.get("/todos/")
+        assert resp.status_code == 503
+    finally:
+        app.dependency_overrides.pop(todos_router.get_todo_service, None)
+
+    health = TestClient(app).get("/health").json()
+    assert health["firestore"]["circuit"] == "open"
+    assert health["status"] == "degraded"
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import anyio.to_thread
+from fastapi.testclient import TestClient
+
+from app import cli, server
+from app.core.config import Settings
+from app.main import app
+
+
+def test_server_options_follow_settings(monkeypatch):
+    monkeypatch.setattr(server, "available_cpus", lambda: 6)
+    options = server.build_server_options(Settings(app_port=9000, server_keepalive_timeout=15))
+    assert options.workers == 6
+    assert options.port == 9000
+    assert options.keepalive_timeout == 15
+    assert options.loop in {"uvloop", "asyncio"}
+
+    assert server.build_server_options(Settings(server_workers=2)).workers == 2
+
+
+def test_serve_command_overrides_settings(monkeypatch):
+    captured = {}
+    monkeypatch.setattr(server, "_serve_uvicorn", lambda options: captured.setdefault("options", options))
+    monkeypatch.setattr(server, "_has_module", lambda name: False)
+
+    assert cli.main(["serve", "--port", "8123", "--workers", "1"]) == 0
+    options = captured["options"]
+    assert options.port == 8123
+    assert options.workers == 1
+    assert options.http == "h11"
+
+
+def test_lifespan_sizes_threadpool():
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+        # The limiter is per event loop; check it from inside the app's loop
+        tokens = client.portal.call(lambda: anyio.to_thread.current_default_thread_limiter().total_tokens)
+    assert tokens == 100
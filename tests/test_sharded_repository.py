@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from app.domain.todos.entities import TodoEntity
+from app.repositories.todos.firestore_repository import merge_ordered
+from app.repositories.todos.sharded_repository import ShardedFirestoreTodoRepository, shard_for, shard_path
+from tests.fakes import FakeFirestoreClient
+
+
+def _entity(todo_id: str, minute: int) -> TodoEntity:
+    ts = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=minute)
+    return TodoEntity(id=todo_id, title=todo_id, description=None, completed=False, created_at=ts, updated_at=ts)
+
+
+def test_shard_for_is_stable_and_in_range():
+    assert shard_for("abc", 16) == shard_for("abc", 16)
+    assert {shard_for(f"id-{i}", 8) for i in range(200)} == set(range(8))
+
+
+def test_merge_ordered_interleaves_shards():
+    merged = merge_ordered([[_entity("a", 1), _entity("d", 4)], [_entity("b", 2)], [], [_entity("c", 3)]])
+    assert [e.id for e in merged] == ["a", "b", "c", "d"]
+
+
+def test_sharded_repository_spreads_writes_and_lists_in_order():
+    client = FakeFirestoreClient()
+    repo = ShardedFirestoreTodoRepository(client=client, shard_count=4)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    created = [
+        repo.create(title=f"t{i}", description=None, completed=False, now=start + timedelta(seconds=i))
+        for i in range(20)
+    ]
+
+    # Every document lives in the shard derived from its id, never in the flat collection
+    assert "todos" not in client.collections or not client.collections["todos"]._store
+    for entity in created:
+        assert entity.id in client.collection(shard_path(shard_for(entity.id, 4)))._store
+    assert sum(1 for path, coll in client.collections.items() if coll._store) > 1
+
+    assert [e.id for e in repo.list()] == [e.id for e in created]
+    assert repo.get(created[5].id).title == "t5"
+    assert repo.update(created[5].id, {"completed": True}, now=start).completed is True
+    assert repo.delete(created[5].id) is True
+    assert repo.get(created[5].id) is None
+
+
+def test_sparse_listing_keeps_creation_order_across_shards():
+    repo = ShardedFirestoreTodoRepository(client=FakeFirestoreClient(), shard_count=4)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    created = [
+        repo.create(title=f"t{i}", description=None, completed=False, now=start + timedelta(seconds=i))
+        for i in range(20)
+    ]
+
+    listed = repo.list(fields=("id", "title", "completed"))
+
+    assert [e.id for e in listed] == [e.id for e in created]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.metrics import metrics
+from app.core.single_flight import SingleFlight
+
+
+class SlowCounter:
+    def __init__(self, delay: float = 0.1) -> None:
+        self.calls = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self) -> int:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return 42
+
+
+def test_concurrent_threads_share_one_call():
+    flight = SingleFlight(name="test.threads")
+    fn = SlowCounter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: flight.do(("list",), fn), range(8)))
+    assert results == [42] * 8
+    assert fn.calls == 1
+    assert metrics.get("test.threads.coalesced") == 7
+
+    # Finished flights are not cached
+    assert flight.do(("list",), fn) == 42
+    assert fn.calls == 2
+
+
+def test_async_callers_share_one_call():
+    flight = SingleFlight(name="test.async")
+    fn = SlowCounter()
+
+    async def run():
+        return await asyncio.gather(*(flight.do_async(("get", "1"), fn) for _ in range(5)))
+
+    assert asyncio.run(run()) == [42] * 5
+    assert fn.calls == 1
+
+
+def test_errors_propagate_to_every_waiter():
+    flight = SingleFlight(name="test.errors")
+
+    def boom():
+        time.sleep(0.05)
+        raise RuntimeError("firestore down")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, "k", boom) for _ in range(4)]
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result()
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight(name="test.cancel")
+    fn = SlowCounter(delay=0.1)
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do_async("k", fn))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(flight.do_async("k", fn))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == 42
+    assert fn.calls == 1
+
+
+def test_flight_is_dropped_when_every_caller_is_cancelled():
+    flight = SingleFlight(name="test.cancel_all")
+    fn = SlowCounter(delay=0.05)
+
+    async def run():
+        caller = asyncio.ensure_future(flight.do_async("k", fn))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        # A later caller starts a new flight instead of joining the abandoned one
+        return await flight.do_async("k", fn)
+
+    assert asyncio.run(run()) == 42
+    assert flight._async_calls == {}
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from app.api.routers import todos as todos_router
+from app.main import app
+from app.repositories.todos.firestore_repository import FirestoreTodoRepository
+from app.services.todos.service import TodoService
+from tests.fakes import FakeFirestoreClient
+
+
+def _client_with_firestore_fake():
+    firestore = FakeFirestoreClient()
+    repo = FirestoreTodoRepository(client=firestore)
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    repo.create(title="A", description="long text " * 50, completed=False, now=now)
+    service = TodoService(repository=repo)
+    app.dependency_overrides[todos_router.get_todo_service] = lambda: service
+    return TestClient(app), firestore
+
+
+def test_fields_projection_reaches_firestore_and_trims_response():
+    client, firestore = _client_with_firestore_fake()
+    try:
+        resp = client.get("/todos/", params={"fields": "title,completed"})
+        assert resp.status_code == 200
+        assert list(resp.json()[0]) == ["id", "title", "completed"]
+        # created_at is read for ordering but not returned
+        assert firestore.collection("todos").last_query.field_paths == ["completed", "created_at", "title"]
+
+        todo_id = resp.json()[0]["id"]
+        resp = client.get(f"/todos/{todo_id}", params={"fields": "description"})
+        assert set(resp.json()) == {"id", "description"}
+
+        # Paging still works when the cursor field is not returned
+        resp = client.get("/todos/paged", params={"fields": "title", "limit": 1, "completed": False})
+        body = resp.json()
+        assert body["items"] == [{"id": todo_id, "title": "A"}]
+        assert body["next_cursor"] is not None
+
+        full = client.get(f"/todos/{todo_id}").json()
+        assert set(full) == {"id", "title", "description", "completed", "created_at", "updated_at"}
+    finally:
+        app.dependency_overrides.pop(todos_router.get_todo_service, None)
+
+
+def test_unknown_fields_are_rejected():
+    client, _ = _client_with_firestore_fake()
+    try:
+        resp = client.get("/todos/", params={"fields": "title,secret"})
+        assert resp.status_code == 422
+        assert "secret" in resp.json()["detail"]
+    finally:
+        app.dependency_overrides.pop(todos_router.get_todo_service, None)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.todos.service import TodoService
+from app.services.todos.write_buffer import WriteCoalescer
+from tests.fakes import FaultInjectingTodoRepository, InMemoryTodoRepository
+
+
+def _service(window: float = 0.1, faults=None):
+    repo = FaultInjectingTodoRepository(InMemoryTodoRepository(), faults=faults)
+    buffer = WriteCoalescer(window=window, name="test.writes")
+    service = TodoService(repository=repo, write_buffer=buffer)
+    todo = repo.create(title="t", description=None, completed=False, now=datetime.now(timezone.utc))
+    return service, repo, todo, buffer
+
+
+def test_concurrent_updates_are_merged_into_one_write():
+    service, repo, todo, _ = _service()
+    updates = [{"completed": True}, {"title": "renamed"}, {"description": "d"}, {"completed": False}]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda u: service.update_todo(todo.id, u), updates))
+
+    assert repo.calls["update"] == 1
+    post = results[0]
+    assert all(r == post for r in results)
+    assert post.title == "renamed"
+    assert post.description == "d"
+    assert post.completed is False
+
+
+def test_updates_outside_the_window_are_written_separately():
+    service, repo, todo, _ = _service(window=0.01)
+    service.update_todo(todo.id, {"completed": True})
+    service.update_todo(todo.id, {"completed": False})
+    assert repo.calls["update"] == 2
+
+
+def test_write_errors_reach_every_merged_caller():
+    service, repo, todo, _ = _service(faults={"update": [RuntimeError("boom")]})
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(service.update_todo, todo.id, {"title": f"t{i}"}) for i in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result()
+    assert repo.calls["update"] == 1